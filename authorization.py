@@ -1,6 +1,10 @@
+import json
+import os
 import pickle
+import time
 from datetime import datetime
 from pathlib import Path
+from typing import Any
 
 from selenium.webdriver.chrome.webdriver import WebDriver
 from selenium.webdriver.common.by import By
@@ -8,12 +12,42 @@ from selenium.webdriver.common.by import By
 from utils.custom_logging import logger
 from utils.human_simulation import random_delay
 
+GAME_URL = "https://www.moswar.ru/"
+
+# Cookies files older than this are treated as expired without reading them (kept below the game's auth TTL)
+MAX_SESSION_AGE = 23 * 60 * 60
+
+
+def _to_cdp_cookie(cookie: dict[str, Any]) -> dict[str, Any]:
+    """
+    Converts a Selenium cookie dict to the format expected by CDP Network.setCookies.
+    """
+    domain = cookie.get("domain", ".moswar.ru")
+    path = cookie.get("path", "/")
+    cdp_cookie = {
+        "name": cookie["name"],
+        "value": cookie["value"],
+        "path": path,
+        "secure": cookie.get("secure", False),
+        "httpOnly": cookie.get("httpOnly", False),
+    }
+    # CDP makes a domain cookie of any given domain, so host-only cookies (no leading dot) are set by url
+    if domain.startswith("."):
+        cdp_cookie["domain"] = domain
+    else:
+        cdp_cookie["url"] = f"https://{domain}{path}"
+    if "expiry" in cookie:
+        cdp_cookie["expires"] = cookie["expiry"]
+    if "sameSite" in cookie:
+        cdp_cookie["sameSite"] = cookie["sameSite"]
+    return cdp_cookie
+
 
 # Function to login to the game
 def log_in(
     driver: WebDriver,
     credentials: dict[str, str],
-    cookies_file_path: str = "./cookies/cookies.pkl",
+    cookies_file_path: str = "./cookies/cookies.json",
 ) -> WebDriver:
     """
     Logs in to the Moswar game using either a saved session (from cookies) or
@@ -27,31 +61,55 @@ def log_in(
     Parameters:
         driver (WebDriver): The Selenium WebDriver instance to interact with the browser.
         credentials (dict): A dictionary containing login credentials with keys "login" and "password".
-        cookies_file_path (str): The path to the cookie file. Default is "./cookies/cookies.pkl".
+        cookies_file_path (str): The path to the cookie file. Default is "./cookies/cookies.json".
 
     Returns:
         WebDriver: The updated WebDriver instance after successful login.
     """
     logger.info("Logging in to the game.")
-    driver.get("https://www.moswar.ru/")
+
+    # Attached browser may already be on the game page, skip the extra page load then
+    is_on_game_page = driver.current_url.startswith(GAME_URL)
 
     # Check if cookies file is expired
     cookies_path = Path(cookies_file_path)
     cookies_folder = cookies_path.parent
     is_expired = True
 
-    if cookies_path.exists():
-        logger.info("Cookies file found, checking if session is expired")
-        with cookies_path.open("rb") as file:
+    # One-shot migration from the old pickle cookies file
+    legacy_cookies_path = cookies_path.with_suffix(".pkl")
+    if legacy_cookies_path.exists() and not cookies_path.exists():
+        logger.info("Migrating cookies file from pickle to JSON")
+        with legacy_cookies_path.open("rb") as file:
             cookies = pickle.load(file)
+        with cookies_path.open("w", encoding="utf-8") as file:
+            json.dump(cookies, file)
+        legacy_stat = legacy_cookies_path.stat()
+        os.utime(cookies_path, (legacy_stat.st_atime, legacy_stat.st_mtime))
+        legacy_cookies_path.unlink()
+
+    try:
+        cookies_stat = cookies_path.stat()
+    except FileNotFoundError:
+        cookies_stat = None
+
+    if cookies_stat and time.time() - cookies_stat.st_mtime > MAX_SESSION_AGE:
+        logger.warning("Cookies file is too old, deleting it")
+        cookies_path.unlink()
+        cookies_stat = None
+
+    if cookies_stat:
+        logger.info("Cookies file found, checking if session is expired")
+        with cookies_path.open("r", encoding="utf-8") as file:
+            cookies = json.load(file)
 
-        for cookie in cookies:
-            if cookie["name"] == "authkey":
-                auth_cookie = cookie
-                break
+        auth_cookie = next((cookie for cookie in cookies if cookie["name"] == "authkey"), None)
 
         current_time = datetime.timestamp(datetime.now())
-        if auth_cookie["expiry"] < current_time:
+        if auth_cookie is None or "expiry" not in auth_cookie:
+            logger.warning("Session cookie not found in cookies file, deleting it")
+            cookies_path.unlink()
+        elif auth_cookie["expiry"] < current_time:
             logger.warning("Session is expired, deleting cookies file")
             cookies_path.unlink()
         else:
@@ -61,15 +119,23 @@ def log_in(
     # Login logic, depending on the session status
     if not is_expired:
         logger.info("Loading session from cookies file")
-        for cookie in cookies:
-            driver.add_cookie(cookie)
-        driver.refresh()
-    else:
-        logger.info(
-            "Cookies file not found or session is expired, creating new session"
+
+        # Cookies are injected before the navigation, so the first page load is already authorized
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd(
+            "Network.setCookies", {"cookies": [_to_cdp_cookie(cookie) for cookie in cookies]}
         )
+        if is_on_game_page:
+            driver.refresh()
+        else:
+            driver.get(GAME_URL)
+    else:
+        logger.info("Cookies file not found or session is expired, creating new session")
         cookies_folder.mkdir(parents=True, exist_ok=True)
 
+        if not is_on_game_page:
+            driver.get(GAME_URL)
+
         # Login
         login_el = driver.find_element(By.NAME, "email")
         login_el.clear()
@@ -83,16 +149,14 @@ def log_in(
         random_delay()
 
         # Enter
-        enter_el = driver.find_element(
-            By.CSS_SELECTOR, 'input[type="submit"][value="Войти"]'
-        )
+        enter_el = driver.find_element(By.CSS_SELECTOR, 'input[type="submit"][value="Войти"]')
         enter_el.click()
         random_delay()
 
         # Save cookies
         logger.info("Saving cookies")
         cookies = driver.get_cookies()
-        with cookies_path.open("wb") as file:
-            pickle.dump(cookies, file)
+        with cookies_path.open("w", encoding="utf-8") as file:
+            json.dump(cookies, file)
 
     return driver
@@ -1,20 +1,41 @@
 from selenium.webdriver.chrome.options import Options
 
 
-def set_options() -> Options:
+def set_options(debugger_address: str | None = None) -> Options:
     """
     Sets up and returns browser options for the Selenium WebDriver.
 
     This function configures various options to optimize browser behavior,
-    including window maximization, disabling automation features, and setting
-    a custom user agent string.
+    including window maximization, disabling automation features, blocking image
+    loading, and setting a custom user agent string.
+
+    If a debugger address is provided, the driver attaches to an already running Chrome instance
+    instead of launching a new one, so the session and browser caches survive between bot runs.
+    Chrome has to be started beforehand, e.g.:
+        chrome --remote-debugging-port=9222 --user-data-dir=./chrome-profile
+
+    A new Options object is built on every call, since Selenium itself mutates the options it is given
+    (e.g. sets the browser binary location) so each driver needs its own.
+
+    Parameters:
+        debugger_address (str | None): Address of a running Chrome instance, e.g. "127.0.0.1:9222".
+            Defaults to None (launch a new browser).
 
     Returns:
         Options: A configured Options object with the specified settings.
     """
+    options = Options()
+
+    # Return control after DOMContentLoaded instead of waiting for every subresource
+    options.page_load_strategy = "eager"
+
+    # Launch-only options are rejected by chromedriver when attaching to a running browser
+    if debugger_address:
+        options.add_experimental_option("debuggerAddress", debugger_address)
+        return options
+
     user_agent = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0.0.0 Safari/537.36"
 
-    options = Options()
     options.add_argument(f"user-agent={user_agent}")
     options.add_argument("start-maximized")
     options.add_argument("--disable-blink-features=AutomationControlled")
@@ -25,4 +46,13 @@ def set_options() -> Options:
     options.add_experimental_option("excludeSwitches", ["enable-automation"])
     options.add_experimental_option("detach", True)
 
+    # Images and notifications are never used by the bot, locators relying on img src still work without them
+    options.add_experimental_option(
+        "prefs",
+        {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.default_content_setting_values.notifications": 2,
+        },
+    )
+
     return options
@@ -1,12 +1,15 @@
+import time
+from types import MappingProxyType
 from typing import Literal
 
-from selenium.common.exceptions import NoSuchElementException
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.chrome.webdriver import WebDriver
 from selenium.webdriver.common.by import By
-from tqdm import tqdm
+from selenium.webdriver.support.ui import WebDriverWait
 
-from entities.player import Player
+from entities.player import PAGE_FRESH_SEC, Player
 from utils.custom_logging import logger
+from utils.general import cdp_evaluate
 from utils.human_simulation import random_delay
 
 # TODO:
@@ -15,6 +18,89 @@ from utils.human_simulation import random_delay
 # 4. change approach to use item, try to find item address by picture name
 # 5. add new items (ошейник)
 
+_PET_IDS = {
+    "Абиссинский Бог": 2471779,
+    "Пантера": 2431326,
+    "Доберман": 1998999,
+    "Чихуа-хуа": 2428452,
+    "Котенок по имени 'ГАФ'": 2468340,
+}
+_PET_BASE_URLS = {
+    name: f"https://www.moswar.ru/petarena/train/{pet_id}/" for name, pet_id in _PET_IDS.items()
+}
+
+# Item image file names, matched as a substring of img src so cache-busting query strings don't break lookups
+_ITEM_IMG_STEMS = {"Косточка": "gift-1.png"}
+
+# Locators reused across calls, CSS/ID lookups are preferred over XPath where text matching is not needed
+_LOC_PET_RESTING = (By.XPATH, '//*[contains(text(), "Питомец отдыхает")]')
+_LOC_TRAIN_BUTTONS = {
+    skill: (By.CSS_SELECTOR, f'button[onclick*="{skill}"]') for skill in ("focus", "loyality", "mass")
+}
+_LOC_ITEM_COUNT = (By.CSS_SELECTOR, "div.count")
+_LOC_ITEM_ACTION = (By.CSS_SELECTOR, "div.action")
+
+# Reads all pet stats from the page in one CDP round-trip, waiting up to 10 seconds for the page load
+# if it's still in progress (CDP has no script timeout of its own)
+PET_INFO_JS = """
+(async () => {
+    if (document.readyState !== "complete") {
+        await Promise.race([
+            new Promise((resolve) => window.addEventListener("load", resolve, { once: true })),
+            new Promise((resolve) => setTimeout(resolve, 10000)),
+        ]);
+    }
+    const read = (selector) => {
+        const el = document.querySelector(selector);
+        if (!el) {
+            throw new Error(`Pet info element '${selector}' not found on ${location.href}`);
+        }
+        return el.innerText;
+    };
+    return {
+        hp: read("#pethp"),
+        focus: read('li[rel="focus"] span.num'),
+        loyality: read('li[rel="loyality"] span.num'),
+        mass: read('li[rel="mass"] span.num'),
+    };
+})()
+"""
+
+# Reads the pet rest state and finds the skill button in one round-trip
+TRAIN_STATE_JS = """
+const [restingXpath, skillSelector] = arguments;
+return {
+    resting: document.evaluate(restingXpath, document, null, XPathResult.BOOLEAN_TYPE, null).booleanValue,
+    button: document.querySelector(skillSelector),
+};
+"""
+
+# Schedules N clicks on the item inside the browser with human-like pauses and returns immediately,
+# progress is kept in a window variable to be polled from Python
+USE_ITEM_JS = """
+const [selector, times] = arguments;
+window.petItemUse = { used: 0, done: false, error: null };
+(async () => {
+    try {
+        for (let i = 0; i < times; i++) {
+            // The inventory may be re-rendered after each use, so the button is looked up before every click
+            const el = document.querySelector(selector);
+            if (!el) {
+                window.petItemUse.error = "Item button is no longer on the page.";
+                break;
+            }
+            el.click();
+            window.petItemUse.used = i + 1;
+            await new Promise((resolve) => setTimeout(resolve, 500 + Math.random() * 1000));
+        }
+    } catch (e) {
+        window.petItemUse.error = String(e);
+    }
+    window.petItemUse.done = true;
+})();
+"""
+USE_ITEM_PROGRESS_JS = "return window.petItemUse || null;"
+
 
 class PetForFightMain:
     """
@@ -22,7 +108,7 @@ class PetForFightMain:
 
     Attributes:
         pet_ids (dict): A dictionary mapping pet names to their unique IDs.
-        item_ids (dict): A dictionary mapping item names to their unique IDs.
+        item_locators (dict): A dictionary mapping item names to the locators of their inventory blocks.
         player: The player object controlling the pet.
         driver: The Selenium WebDriver instance.
         name (str): The name of the pet.
@@ -36,15 +122,25 @@ class PetForFightMain:
         mass (int): The mass stat of the pet.
     """
 
-    pet_ids = {
-        "Абиссинский Бог": 2471779,
-        "Пантера": 2431326,
-        "Доберман": 1998999,
-        "Чихуа-хуа": 2428452,
-        "Котенок по имени 'ГАФ'": 2468340,
-    }
-
-    item_img_links = {"Косточка": "/@/images/obj/gifts/gift-1.png"}
+    __slots__ = (
+        "player",
+        "driver",
+        "name",
+        "pet_id",
+        "BASE_URL",
+        "currenthp",
+        "currenthp_max",
+        "currenthp_prc",
+        "focus",
+        "loyality",
+        "mass",
+        "_last_open_ts",
+    )
+
+    pet_ids = MappingProxyType(_PET_IDS)
+    item_locators = MappingProxyType(
+        {item: (By.CSS_SELECTOR, f'div:has(> img[src*="/{stem}"])') for item, stem in _ITEM_IMG_STEMS.items()}
+    )
 
     def __init__(self, player: Player, driver: WebDriver, name: str):
         """
@@ -66,7 +162,7 @@ class PetForFightMain:
         self.driver = driver
         self.name = name
         self.pet_id = self.pet_ids[name]
-        self.BASE_URL = f"https://www.moswar.ru/petarena/train/{self.pet_id}/"
+        self.BASE_URL = _PET_BASE_URLS[name]
 
         # Pet health
         self.currenthp = 0.0
@@ -78,12 +174,18 @@ class PetForFightMain:
         self.loyality = 0
         self.mass = 0
 
+        # Last page load done by open(), used to skip reloads of a freshly opened page
+        self._last_open_ts = 0.0
+
         self.update_pet_info()
         logger.info(f"Pet '{self.name}' successfully initialized.")
 
-    def open(self) -> None:
+    def open(self, force: bool = False) -> None:
         """
         This method ensures the driver is on the pet page by navigating to its URL.
+
+        Parameters:
+            force (bool): If True, reloads the page even if it was opened moments ago. Defaults to False.
         """
         if self.driver.current_url != self.BASE_URL:
             logger.info(
@@ -91,12 +193,16 @@ class PetForFightMain:
             )
             self.driver.get(self.BASE_URL)
             random_delay()
+        elif not force and time.monotonic() - self._last_open_ts < PAGE_FRESH_SEC:
+            logger.info(f"Driver has just opened the '{self.name}' pet page, skipping reload.")
+            return
         else:
             logger.info(f"Driver is already on the '{self.name}' pet page, refreshing.")
             self.driver.refresh()
             random_delay()
 
-    # TODO: update using setattr function
+        self._last_open_ts = time.monotonic()
+
     def update_pet_info(self) -> None:
         """
         Updates the information about pet's stats and health by retrieving the information from the webpage.
@@ -104,29 +210,65 @@ class PetForFightMain:
         logger.info(f"Updating '{self.name}' pet stats and heatlh info.")
         self.open()
 
+        self._set_pet_info(cdp_evaluate(self.driver, PET_INFO_JS, await_promise=True))
+
+    def _set_pet_info(self, pet_info: dict[str, str]) -> None:
+        """
+        Sets pet's health and stats from the values returned by the pet info script.
+        """
         # Health
-        hp_el = self.driver.find_element(By.XPATH, '//span[@id="pethp"]')
-        self.currenthp = float(hp_el.text.split("/")[0])
-        self.currenthp_max = float(hp_el.text.split("/")[1])
+        currenthp, _, currenthp_max = pet_info["hp"].partition("/")
+        self.currenthp = float(currenthp)
+        self.currenthp_max = float(currenthp_max)
         self.currenthp_prc = self.currenthp / self.currenthp_max
 
-        # Focus
-        focus_el = self.driver.find_element(
-            By.XPATH, '//li[@rel="focus"]//span[@class="num"]'
-        )
-        self.focus = int(focus_el.text)
+        # Stats
+        for stat in ["focus", "loyality", "mass"]:
+            setattr(self, stat, int(pet_info[stat]))
 
-        # Loyality
-        loyality_el = self.driver.find_element(
-            By.XPATH, '//li[@rel="loyality"]//span[@class="num"]'
-        )
-        self.loyality = int(loyality_el.text)
+    @classmethod
+    def refresh_all(cls, pets: list["PetForFightMain"]) -> None:
+        """
+        Updates stats and health of several pets at once.
 
-        # Mass
-        mass_el = self.driver.find_element(
-            By.XPATH, '//li[@rel="mass"]//span[@class="num"]'
-        )
-        self.mass = int(mass_el.text)
+        Each pet page is opened in its own background tab via CDP, so the pages load in parallel,
+        then the stats are read tab by tab and the tabs are closed.
+
+        Parameters:
+            pets (list[PetForFightMain]): Pets to update, all of them must share the same driver.
+        """
+        if not pets:
+            return None
+
+        driver = pets[0].driver
+        logger.info(f"Updating stats and health info for {len(pets)} pets.")
+        # A new tab starts on about:blank, which is already "complete", so the pet URL is checked too
+        page_ready_js = "return location.href.startsWith(arguments[0]) && document.readyState === 'complete';"
+
+        original_window = driver.current_window_handle
+        target_ids: list[str] = []
+        try:
+            for pet in pets:
+                target = driver.execute_cdp_cmd(
+                    "Target.createTarget", {"url": pet.BASE_URL, "background": True}
+                )
+                target_ids.append(target["targetId"])
+
+            # Chromedriver window handles are the CDP target ids
+            for pet, target_id in zip(pets, target_ids):
+                driver.switch_to.window(target_id)
+                try:
+                    WebDriverWait(driver, 10, poll_frequency=0.1).until(
+                        lambda d: d.execute_script(page_ready_js, pet.BASE_URL)
+                    )
+                except TimeoutException:
+                    logger.error(f"Pet '{pet.name}' page was not loaded in time, its info was not updated.")
+                    continue
+                pet._set_pet_info(cdp_evaluate(pet.driver, PET_INFO_JS, await_promise=True))
+        finally:
+            for target_id in target_ids:
+                driver.execute_cdp_cmd("Target.closeTarget", {"targetId": target_id})
+            driver.switch_to.window(original_window)
 
     def train(self, skill_to_train: Literal["focus", "loyality", "mass"]) -> None:
         """
@@ -146,26 +288,27 @@ class PetForFightMain:
         logger.info(f"Training '{skill_to_train}' for '{self.name}' pet.")
         self.open()
 
+        if skill_to_train not in _LOC_TRAIN_BUTTONS:
+            logger.error(f"Skill '{skill_to_train}' is not supported.")
+            return None
+
+        state = self.driver.execute_script(
+            TRAIN_STATE_JS, _LOC_PET_RESTING[1], _LOC_TRAIN_BUTTONS[skill_to_train][1]
+        )
+
         # Check if pet is on rest
-        try:
-            self.driver.find_element(
-                By.XPATH, '//*[contains(text(), "Питомец отдыхает")]'
-            )
+        if state["resting"]:
             logger.error("Pet is on rest, can't train.")
             return None
-        except NoSuchElementException:
-            pass
 
         # Find skill address and train
-        try:
-            train_el = self.driver.find_element(
-                By.XPATH, f'//button[contains(@onclick, "{skill_to_train}")]'
-            )
-        except NoSuchElementException:
+        train_el = state["button"]
+        if train_el is None:
             logger.error(f"Skill '{skill_to_train}' is not available for training.")
             return None
 
         train_el.click()
+        self._last_open_ts = 0.0
         random_delay()
         logger.info(f"Started training '{skill_to_train}' for '{self.name}' pet.")
         return None
@@ -183,25 +326,23 @@ class PetForFightMain:
             item (str): The name of the item to use.
             times (int): The number of times to use the item.
         """
+        from tqdm import tqdm
+
         logger.info(f"Using {item} for {times} times.")
         self.open()
 
         # Create element objects for item
-        if item not in self.item_img_links.keys():
+        if item not in self.item_locators:
             logger.error(f"Item '{item}' is not supported.")
             return None
 
-        item_img_link = self.item_img_links[item]
-        item_el_addr = f'//img[@src="{item_img_link}"]/parent::div'
-
-        try:
-            item_el = self.driver.find_element(By.XPATH, item_el_addr)
-        except NoSuchElementException:
+        item_els = self.driver.find_elements(*self.item_locators[item])
+        if not item_els:
             logger.error(f"Item '{item}' is not available.")
             return None
+        item_el = item_els[0]
 
-        count_el = item_el.find_element(By.XPATH, ".//div[@class='count']")
-        action_el = item_el.find_element(By.XPATH, ".//div[@class='action']")
+        count_el = item_el.find_element(*_LOC_ITEM_COUNT)
 
         # Stop function if there are less items available than we want to use
         count = int(count_el.text.replace("#", ""))
@@ -211,17 +352,31 @@ class PetForFightMain:
             )
             return None
 
-        # Use items
+        # Use items, clicks run in the browser while Python only polls the progress
         used_times = 0
-        for _ in tqdm(range(times), desc=f"Using '{item}'"):
-            try:
-                action_el.click()
-                used_times += 1
-                random_delay(0.5, 1.5)
-            except Exception as e:
-                logger.error("Something went wrong while using the item, stopping.")
-                logger.error(e)
-                return None
+        try:
+            action_selector = f"{self.item_locators[item][1]} {_LOC_ITEM_ACTION[1]}"
+            self.driver.execute_script(USE_ITEM_JS, action_selector, times)
+            with tqdm(total=times, desc=f"Using '{item}'", mininterval=1.0) as progress_bar:
+                while True:
+                    time.sleep(1)
+                    progress = self.driver.execute_script(USE_ITEM_PROGRESS_JS)
+                    if progress is None:
+                        logger.error("Pet page was reloaded while using the item, stopping.")
+                        break
+
+                    progress_bar.update(progress["used"] - used_times)
+                    used_times = progress["used"]
+                    if progress["done"]:
+                        if progress["error"]:
+                            logger.error("Something went wrong while using the item, stopping.")
+                            logger.error(progress["error"])
+                        break
+        except Exception as e:
+            logger.error("Something went wrong while using the item, stopping.")
+            logger.error(e)
+        finally:
+            self._last_open_ts = 0.0
 
         logger.info(f"Used '{item}' for {used_times} times.")
         return None
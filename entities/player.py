@@ -1,18 +1,133 @@
+import functools
+import json
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Literal
+from typing import Callable, ClassVar, Literal
 
-from selenium.common.exceptions import NoSuchElementException
+import requests
+from lxml import etree, html
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException
 from selenium.webdriver.chrome.webdriver import WebDriver
 from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.webelement import WebElement
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
 
 from schemas.player import RestoreEnergyType
 from utils.custom_logging import logger
-from utils.decorators import require_location_page
+from utils.decorators import is_fresh, mark_fresh, require_location_page, skip_if_fresh
+from utils.general import cdp_evaluate, parse_date
 from utils.human_simulation import random_delay
 
 # TODO: add status of the player, searching< fighting, etc.
 
 
+# Clicks the item's use button the given number of times with human-like pauses, returns the number of clicks
+USE_ITEM_JS = """
+const [xpath, times, done] = arguments;
+const findButton = () => document.evaluate(
+    xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+).singleNodeValue;
+let used = 0;
+const tick = () => {
+    // The inventory may be re-rendered after each use, so the button is looked up again before every click
+    const el = findButton();
+    if (used >= times || !el) {
+        done(used);
+        return;
+    }
+    el.click();
+    used++;
+    setTimeout(tick, 2000 + Math.random() * 1000);
+};
+tick();
+"""
+
+
+# Reads all given fields in one pass over the page, or returns null if the driver is not on the expected page
+SCRAPE_JS = """
+(pageUrl, fields) => {
+    if (pageUrl && location.href !== pageUrl) return null;
+    const find = (by, selector) => {
+        if (by === "id") return document.getElementById(selector);
+        if (by === "css selector") return document.querySelector(selector);
+        return document.evaluate(
+            selector, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+        ).singleNodeValue;
+    };
+    const out = {};
+    for (const [key, [by, selector, attribute]] of Object.entries(fields)) {
+        const el = find(by, selector);
+        if (!el) {
+            out[key] = null;
+        } else if (!attribute) {
+            out[key] = el.textContent;
+        } else {
+            // Reflected attributes such as title are read as a plain property
+            out[key] = attribute in el ? el[attribute] : el.getAttribute(attribute);
+        }
+    }
+    return out;
+}
+"""
+
+# How long a page opened by open() is considered fresh enough to skip reloading it
+PAGE_FRESH_SEC = 5.0
+
+NUMBER_RE = re.compile(r"\d+")
+# Expiration date in the stash major status text, like "18 августа 2025 20:13"
+MAJOR_DATE_RE = re.compile(r"\d{1,2} \w+ \d{4} \d{1,2}:\d{2}")
+# Experience counter reads as "current/needed", digits may be grouped with spaces or commas
+EXPERIENCE_RE = re.compile(r"(\d[\d\s,]*)/\s*(\d[\d\s,]*)")
+
+
+def parse_int(text: str) -> int:
+    """
+    Extracts an integer from a text, ignoring any thousands separators, "#", brackets and labels around it.
+    Returns 0 if the text contains no digits.
+    """
+    digits = NUMBER_RE.findall(text)
+    return int("".join(digits)) if digits else 0
+
+
+def parse_minutes_left(text: str | None) -> int:
+    """
+    Reads the number of minutes from a "... N минут" time left counter, 0 if there is no counter.
+    """
+    numbers = NUMBER_RE.findall(text) if text else []
+    return int(numbers[-1]) if numbers else 0
+
+
+def scrape(
+    driver: WebDriver, fields: dict[str, tuple[str, str, str | None]], page_url: str | None = None
+) -> dict[str, str | None] | None:
+    """
+    Reads values of several elements of the page loaded in the browser with a single CDP call.
+
+    Parameters:
+        driver (WebDriver): Chrome driver to read the page of.
+        fields (dict[str, tuple[str, str, str | None]]): Mapping of result keys to (By, selector,
+            attribute) triples. Only By.ID, By.CSS_SELECTOR and By.XPATH are supported.
+            If the attribute is None, text content of the element is read.
+        page_url (str | None): If set, values are read only if the driver is on this URL.
+
+    Returns:
+        dict[str, str | None] | None: Mapping of result keys to values, None for elements not found
+            on the page. None if the driver is not on page_url.
+    """
+    return cdp_evaluate(driver, f"({SCRAPE_JS})({json.dumps(page_url)}, {json.dumps(fields)})")
+
+
+@functools.lru_cache(maxsize=None)
+def compiled_xpath(expression: str) -> etree.XPath:
+    """
+    Compiles an XPath expression once and reuses it for every page read.
+    """
+    return etree.XPath(expression)
+
+
 class Player:
     """
     Represents a Player in the Moswar game.
@@ -21,17 +136,99 @@ class Player:
     player attributes, such as health, energy, stats, resources, and activities.
     """
 
+    __slots__ = (
+        "driver",
+        "_elem_cache",
+        "_cache_url",
+        "_http",
+        "_last_open_ts",
+        "_last_update_ts",
+        # Player level
+        "level",
+        "experience",
+        "experience_needed_to_level",
+        # Player health and energy, current values are stored behind the hp_current/mp_current properties
+        "hp_max",
+        "_hp_current",
+        "hp_current_prc",
+        "mp_max",
+        "_mp_current",
+        "mp_current_prc",
+        # Player stats
+        "health",
+        "strength",
+        "dexterity",
+        "resistance",
+        "intuition",
+        "attention",
+        "charism",
+        # Sum of the stats above, kept in sync by _set_stats
+        "total_stats",
+        # Player basic recourses
+        "money",
+        "ore",
+        "oil",
+        "honey",
+        # Player additional recourses
+        "mobiles",
+        "stars",
+        "hunter_tokens",
+        "tooth_white",
+        "pet_medals",
+        "powers",
+        "patriotisms",
+        "debts",
+        "travel_shuffles",
+        "travel_passes",
+        "moskowpoly_dices",
+        "casino_chips",
+        "petrics",
+        # Player acitve items
+        "pielmienies",
+        "tonuses",
+        "snickers",
+        "irons",
+        # Player statuses
+        "on_rest",
+        "on_patrol",
+        "on_work",
+        "on_TV",
+        "in_battle",
+        "in_underground",
+        "awaits_battle",
+        "major_is_active",
+        "major_expiration_date",
+        "police_is_active",
+        "police_expiration_date",
+        "tattoo_is_available",
+        "tattoo_availability_date",
+        # Player time left to do activities
+        "patrol_time_left",
+        "work_time_left",
+        "TV_time_left",
+    )
+
     BASE_URL = "https://www.moswar.ru/player/"
+    STASH_URL = "https://www.moswar.ru/stash/"
+    BEREZKA_URL = "https://www.moswar.ru/berezka/"
+    # While in a fight or a dungeon the game keeps the driver on pages under these URLs
+    FIGHT_URL = "https://www.moswar.ru/fight/"
+    DUNGEON_URL = "https://www.moswar.ru/dungeon/inside/"
+    # Locators read in the browser use CSS where no text matching or parent traversal is needed, class
+    # attributes are matched exactly as [class='...'] like the XPath @class equality they replace,
+    # inventory items stay XPath since their counters and use buttons are found from the image's parent.
+    # Stash and berezka locators (major_status, base, advanced resources) are evaluated by lxml on the
+    # fetched page source, so they stay XPath.
     LOCATORS = {
         # Health and Energy
-        "hp_current": (By.XPATH, '//*[@id="personal"]//*[@id="currenthp"]'),
-        "hp_max": (By.XPATH, '//*[@id="personal"]//*[@id="maxhp"]'),
-        "mp_current": (By.XPATH, '//*[@id="personal"]//*[@id="currenttonus"]'),
-        "mp_max": (By.XPATH, '//*[@id="personal"]//*[@id="maxenergy"]'),
+        "hp_current": (By.CSS_SELECTOR, "#personal #currenthp"),
+        "hp_max": (By.CSS_SELECTOR, "#personal #maxhp"),
+        "mp_current": (By.CSS_SELECTOR, "#personal #currenttonus"),
+        "mp_max": (By.CSS_SELECTOR, "#personal #maxenergy"),
         "stats": (By.CSS_SELECTOR, "li.stat"),
         # Level related
-        "level": (By.XPATH, "//h3[@class='curves clear']/span[@class='user ']/span[@class='level']"),
-        "experience": (By.XPATH, "//div[@class='exp']"),
+        "level": (By.CSS_SELECTOR, "h3[class='curves clear'] > span[class='user '] > span[class='level']"),
+        "experience": (By.CSS_SELECTOR, "div[class='exp']"),
         # Major status
         "major_status": (By.XPATH, "//p[contains(text(), 'Ваш статус мажора закончится')]"),
         # Waiting for battle
@@ -40,10 +237,10 @@ class Player:
             "//*[span[@class='text' and text()='Ожидание боя'] and span[@class='timeleft']]",
         ),
         # Player basic resources
-        "money": (By.XPATH, "//li[@class='tugriki-block']"),
-        "ore": (By.XPATH, "//li[@class='ruda-block']"),
-        "oil": (By.XPATH, "//li[@class='neft-block']"),
-        "honey": (By.XPATH, "//li[@class='med-block']"),
+        "money": (By.CSS_SELECTOR, "li[class='tugriki-block']"),
+        "ore": (By.CSS_SELECTOR, "li[class='ruda-block']"),
+        "oil": (By.CSS_SELECTOR, "li[class='neft-block']"),
+        "honey": (By.CSS_SELECTOR, "li[class='med-block']"),
         # Player advanced resources
         "base": (By.XPATH, "//div[contains(text(), 'У вас в наличии:')]"),
         "mobiles": (By.XPATH, "//span[@class='mobila']"),
@@ -64,18 +261,49 @@ class Player:
         "moskowpoly_dices": (By.XPATH, "//img[@src='/@/images/obj/gifts2017/moscowpoly/dice1.png']"),
         # Health restoration
         "restore_health_button": (
-            By.XPATH,
-            '//i[contains(@onclick, "showHPAlert();") and not(contains(@style, "display:none;"))]',
+            By.CSS_SELECTOR,
+            'i[onclick*="showHPAlert();"]:not([style*="display:none;"])',
         ),
         "restore_health_confirm": (By.XPATH, '//div[@class="c" and contains(text(), "Вылечиться - ")]'),
         # Energy restoration
         "restore_energy_button": (
-            By.XPATH,
-            '//i[contains(@onclick, "jobShowTonusAlert();") and not(contains(@style, "display:none;"))]',
+            By.CSS_SELECTOR,
+            'i[onclick*="jobShowTonusAlert();"]:not([style*="display:none;"])',
         ),
         "restore_energy_tonus": (By.XPATH, '//div[@class="c" and contains(., " — «Тонус+»")]'),
         "restore_energy_ore": (By.XPATH, '//div[@class="c" and .//span[@class="ruda" and text()="10"]]'),
     }
+    STATS = ("health", "strength", "dexterity", "resistance", "intuition", "attention", "charism")
+    BASIC_RECOURSES = ("money", "ore", "oil", "honey")
+    INVENTORY_RECOURSES = (
+        "pielmienies",
+        "tonuses",
+        "snickers",
+        "irons",
+        "travel_shuffles",
+        "travel_passes",
+        "moskowpoly_dices",
+    )
+    ADVANCED_RECOURSES = (
+        "mobiles",
+        "stars",
+        "hunter_tokens",
+        "tooth_white",
+        "pet_medals",
+        "powers",
+        "patriotisms",
+        "debts",
+    )
+    # Scrape fields as (By, selector, attribute) triples, derived from LOCATORS once below the class
+    HEALTH_AND_ENERGY_FIELDS: ClassVar[dict[str, tuple[str, str, str | None]]]
+    STATS_FIELDS: ClassVar[dict[str, tuple[str, str, str | None]]]
+    RECOURSES_BASIC_FIELDS: ClassVar[dict[str, tuple[str, str, str | None]]]
+    RECOURSES_INVENTORY_FIELDS: ClassVar[dict[str, tuple[str, str, str | None]]]
+    PLAYER_PAGE_FIELDS: ClassVar[dict[str, tuple[str, str, str | None]]]
+    # Advanced resources by the class of their counter span in the berezka "base" block
+    ADVANCED_CLASSES: ClassVar[dict[str, str]]
+    # XPaths of the use buttons next to the inventory item images
+    INVENTORY_ACTION_XPATHS: ClassVar[dict[str, str]]
 
     def __init__(self, driver: WebDriver, update_info_on_init: bool = True):
         """
@@ -83,59 +311,33 @@ class Player:
 
         Parameters:
             driver (WebDriver): Selenium WebDriver instance for interacting with the game's web interface.
-            update_info_on_init (bool): Whether to fetch and update player data upon initialization. Defaults to True.
+            update_info_on_init (bool): Whether to fetch and update player data upon initialization.
+                Defaults to True. Otherwise load it when needed with the update or ensure_*() methods,
+                attributes that were not loaded yet raise AttributeError.
         """
         self.driver = driver
 
-        # Player level
-        self.level = 0
-        self.experience = 0
-        self.experience_needed_to_level = 0
-
-        # Player health and energy
-        self.hp_max = 0.0
-        self.hp_current = 0.0
-        self.hp_current_prc = 1.0
-        self.mp_max = 0.0
-        self.mp_current = 0.0
-        self.mp_current_prc = 1.0
+        # Missing elements are a common case, so lookups use explicit short waits instead of implicit one
+        self.driver.implicitly_wait(0)
 
-        # Player stats
-        self.health = 0
-        self.strength = 0
-        self.dexterity = 0
-        self.resistance = 0
-        self.intuition = 0
-        self.attention = 0
-        self.charism = 0
+        # Elements found on the current page view, dropped on navigation or refresh
+        self._elem_cache: dict[tuple[str, str], WebElement] = {}
+        self._cache_url: str | None = None
 
-        # Player basic recourses
-        self.money = 0
-        self.ore = 0
-        self.oil = 0
-        self.honey = 0
+        # HTTP session with the browser's cookies for read-only pages, created on first use
+        self._http: requests.Session | None = None
 
-        # Player additional recourses
-        self.mobiles = 0
-        self.stars = 0
-        self.hunter_tokens = 0
-        self.tooth_white = 0
-        self.pet_medals = 0
-        self.powers = 0
-        self.patriotisms = 0
-        self.debts = 0
-        self.travel_shuffles = 0
-        self.travel_passes = 0
-        self.moskowpoly_dices = 0
+        # Last page load done by open(), used to skip reloads of a freshly opened page
+        self._last_open_ts = 0.0
+
+        # Last run of the update methods that skip repeated calls, by method name
+        self._last_update_ts: dict[str, float] = {}
+
+        # Player level, health, energy, stats, recourses and major status are set by the update methods,
+        # see ensure_player_page(). Recourses below are not read from any page yet.
         self.casino_chips = 0
         self.petrics = 0
 
-        # Player acitve items
-        self.pielmienies = 0
-        self.tonuses = 0
-        self.snickers = 0
-        self.irons = 0
-
         # Player statuses
         self.on_rest = False
         self.on_patrol = False
@@ -146,7 +348,6 @@ class Player:
         self.awaits_battle = False
 
         # Player statuses (time dependent) TODO: add expiration date checks
-        self.major_is_active = False
         self.major_expiration_date: datetime | None = None
         self.police_is_active = True
         self.police_expiration_date: datetime | None = None
@@ -162,23 +363,25 @@ class Player:
         self.update_player_info() if update_info_on_init else None
         logger.info("Player successfully initialized.")
 
-    def __setattr__(self, name: str, value: float):
+    @property
+    def hp_current(self) -> float:
+        return self._hp_current
+
+    @hp_current.setter
+    def hp_current(self, value: float) -> None:
         # HP prc auto update
-        object.__setattr__(self, name, value)
-        if name == "hp_current":
-            hp_max = getattr(self, "hp_max", None)
-            if hp_max and hp_max != 0:
-                object.__setattr__(self, "hp_current_prc", value / hp_max)
-            else:
-                object.__setattr__(self, "hp_current_prc", 1.0)
+        self._hp_current = value
+        self.hp_current_prc = value / self.hp_max if self.hp_max else 1.0
 
+    @property
+    def mp_current(self) -> float:
+        return self._mp_current
+
+    @mp_current.setter
+    def mp_current(self, value: float) -> None:
         # MP prc auto update
-        if name == "mp_current":
-            mp_max = getattr(self, "mp_max", None)
-            if mp_max and mp_max != 0:
-                object.__setattr__(self, "mp_current_prc", value / mp_max)
-            else:
-                object.__setattr__(self, "mp_current_prc", 1.0)
+        self._mp_current = value
+        self.mp_current_prc = value / self.mp_max if self.mp_max else 1.0
 
     def is_opened(self) -> bool:
         """
@@ -186,142 +389,458 @@ class Player:
         """
         return self.driver.current_url == self.BASE_URL
 
-    def open(self) -> None:
+    def open(self, force: bool = False, url: str | None = None) -> None:
         """
         This method ensures the driver is on the player page by navigating to its URL.
+
+        Parameters:
+            force (bool): If True, reloads the page even if it was opened moments ago. Defaults to False.
+            url (str | None): Already known current URL of the driver. Defaults to None (read it).
         """
-        if not self.is_opened():
+        if (url or self.driver.current_url) != self.BASE_URL:
             logger.info("Driver is not on the player page. Going to the player.")
             self.driver.get(self.BASE_URL)
-            random_delay()
+            self._wait_ready()
+            self._elem_cache.clear()
+        elif not force and time.monotonic() - self._last_open_ts < PAGE_FRESH_SEC:
+            logger.info("Driver has just opened the player page, skipping reload.")
+            return
         else:
             logger.info("Driver is already on the player page, refreshing.")
-            self.driver.refresh()
-            random_delay()
+            self._refresh()
+
+        self._last_open_ts = time.monotonic()
+
+    def _wait_ready(self, timeout: float = 5.0) -> None:
+        """
+        Waits until the page has finished loading. Used instead of a random delay before reading the page,
+        since reading doesn't send anything to the server.
+
+        Parameters:
+            timeout (float): Maximum time to wait in seconds. Defaults to 5.0.
+        """
+        try:
+            WebDriverWait(self.driver, timeout, poll_frequency=0.1).until(
+                lambda d: d.execute_script("return document.readyState;") == "complete"
+            )
+        except TimeoutException:
+            logger.warning(f"Page was not fully loaded in {timeout} seconds, reading it as is.")
+
+    def _refresh(self) -> None:
+        """
+        Refreshes the current page and drops elements cached for it.
+        """
+        self.driver.refresh()
+        self._wait_ready()
+        self._elem_cache.clear()
 
     # ------------------------
     # PLAYER INFO UPDATES
     # ------------------------
-    def update_health_and_energy(self, is_refresh: bool = True) -> None:
+    def _wait_for(self, locator: tuple[str, str], timeout: float = 2.0) -> WebElement | None:
+        """
+        Waits for an element to be present on the page.
+        Found elements are cached until the page URL changes or it is refreshed.
+
+        Parameters:
+            locator (tuple[str, str]): Locator of the element.
+            timeout (float): Maximum time to wait in seconds. Defaults to 2.0.
+
+        Returns:
+            WebElement | None: The element, or None if it did not appear within the timeout.
+        """
+        current_url = self.driver.current_url
+        if current_url != self._cache_url:
+            self._elem_cache.clear()
+            self._cache_url = current_url
+        if locator in self._elem_cache:
+            return self._elem_cache[locator]
+
+        try:
+            element = WebDriverWait(
+                self.driver, timeout, poll_frequency=0.1, ignored_exceptions=(StaleElementReferenceException,)
+            ).until(EC.presence_of_element_located(locator))
+        except TimeoutException:
+            return None
+
+        self._elem_cache[locator] = element
+        return element
+
+    def _click(self, locator: tuple[str, str], attempts: int = 3) -> bool:
+        """
+        Clicks an element, re-resolving only this locator if the element went stale after a DOM update.
+
+        Parameters:
+            locator (tuple[str, str]): Locator of the element.
+            attempts (int): Maximum number of click attempts. Defaults to 3.
+
+        Returns:
+            bool: True if the element was found and clicked, else False.
+        """
+        for attempt in range(attempts):
+            element = self._wait_for(locator)
+            if element is None:
+                return False
+            try:
+                element.click()
+                break
+            except StaleElementReferenceException:
+                self._elem_cache.pop(locator, None)
+                if attempt == attempts - 1:
+                    logger.error(f"Element {locator} kept going stale, it was not clicked.")
+                    return False
+                time.sleep(0.1)
+
+        # The page has changed, the next open() has to reload it
+        self._last_open_ts = 0.0
+        return True
+
+    def _parse_page(self) -> html.HtmlElement:
+        """
+        Parses the current page source of the driver with lxml.
+        """
+        return html.fromstring(self.driver.page_source)
+
+    def _http_session(self, reset: bool = False) -> requests.Session:
+        """
+        Returns the HTTP session sharing the browser's cookies and user agent.
+
+        Parameters:
+            reset (bool): Whether to recreate the session with fresh browser cookies. Defaults to False.
+        """
+        if self._http is None or reset:
+            session = requests.Session()
+            session.headers["User-Agent"] = self.driver.execute_script("return navigator.userAgent;")
+            for cookie in self.driver.get_cookies():
+                session.cookies.set(cookie["name"], cookie["value"], domain=cookie.get("domain", ""))
+            self._http = session
+        return self._http
+
+    def _fetch_html(self, url: str, renew_cookies: bool = True) -> html.HtmlElement | None:
+        """
+        Downloads a read-only page over HTTP without rendering it in the browser.
+
+        Parameters:
+            url (str): URL of the page.
+            renew_cookies (bool): Whether to retry with fresh cookies from the driver if the request is not
+                authorized. Defaults to True.
+
+        Returns:
+            html.HtmlElement | None: Parsed page, or None if the request failed or was redirected away
+                (e.g. to the login page).
+        """
+        # Retry once with fresh cookies in case the browser session was renewed
+        for reset in (False, True) if renew_cookies else (False,):
+            try:
+                response = self._http_session(reset).get(url, timeout=10)
+            except requests.RequestException as e:
+                logger.warning(f"Failed to fetch '{url}' over HTTP: {e}")
+                return None
+            if response.ok and response.url == url:
+                return html.fromstring(response.text)
+
+        logger.warning(f"Request to '{url}' was not authorized, falling back to the browser.")
+        return None
+
+    def _load_page(self, url: str) -> html.HtmlElement:
+        """
+        Loads a read-only page over HTTP, falling back to the browser if the session is not authorized.
+
+        Parameters:
+            url (str): URL of the page.
+        """
+        tree = self._fetch_html(url)
+        if tree is not None:
+            return tree
+
+        self.driver.get(url)
+        self._wait_ready()
+        self._elem_cache.clear()
+        return self._parse_page()
+
+    def _set_health_and_energy(self, values: dict[str, str | None]) -> bool:
+        """
+        Sets player's health and energy from the values read from the page.
+
+        Returns:
+            bool: True if the values were set, False if the counters were not found on the page.
+        """
+        texts = {key: (values.get(key) or "").strip() for key in self.HEALTH_AND_ENERGY_FIELDS}
+        missing = [key for key, text in texts.items() if not text]
+        if missing:
+            logger.error(f"Error updating player health and energy, not found on the page: {missing}")
+            return False
+
+        hp_max, hp_current = float(texts["hp_max"]), float(texts["hp_current"])
+        mp_max, mp_current = float(texts["mp_max"]), float(texts["mp_current"])
+
+        # Both values are known here, so percentages are computed once and the property setters are bypassed
+        self.hp_max, self._hp_current = hp_max, hp_current
+        self.hp_current_prc = hp_current / hp_max if hp_max else 1.0
+        self.mp_max, self._mp_current = mp_max, mp_current
+        self.mp_current_prc = mp_current / mp_max if mp_max else 1.0
+        return True
+
+    def _set_stats(self, values: dict[str, str | None]) -> bool:
+        """
+        Sets player's stats, level, and experience from the values read from the player page.
+
+        Returns:
+            bool: True if the stats were updated, False if they were not found on the page.
+        """
+        texts = {key: (values.get(key) or "").strip() for key in self.STATS_FIELDS}
+        missing = [key for key, text in texts.items() if not text]
+        if missing:
+            logger.error(f"Error updating player stats, not found on the page: {missing}")
+            return False
+
+        experience_match = EXPERIENCE_RE.search(texts["experience"])
+        if experience_match is None:
+            logger.error(f"Error updating player stats, unexpected experience text: '{texts['experience']}'")
+            return False
+
+        # Stats
+        for stat, text in texts.items():
+            if stat not in ["level", "experience"]:
+                setattr(self, stat, parse_int(text))
+        self.total_stats = sum(parse_int(texts[stat]) for stat in self.STATS)
+
+        # Level
+        self.level = parse_int(texts["level"])
+
+        # Experience
+        current, needed = map(parse_int, experience_match.groups())
+        self.experience = current
+        self.experience_needed_to_level = needed
+
+        if needed - current <= 200:
+            logger.warning("There are less than 200 experience points to level up.")
+        return True
+
+    def _set_recourses_basic(self, values: dict[str, str | None]) -> None:
+        """
+        Sets player's basic resources from the values read from the page.
+        """
+        for recourse in self.RECOURSES_BASIC_FIELDS:
+            recourse_attr = values.get(recourse)
+            if recourse_attr is None:
+                logger.error(f"Basic recourse '{recourse}' not found on the page, it will not be updated.")
+                continue
+            setattr(self, recourse, parse_int(recourse_attr))
+
+    def _set_recourses_inventory(self, values: dict[str, str | None]) -> None:
+        """
+        Sets player's inventory resources from the values read from the player page.
+        """
+        for recourse in self.RECOURSES_INVENTORY_FIELDS:
+            text = values.get(recourse)
+            if text is None:
+                logger.error(
+                    f"Inventory recourse '{recourse}' not found on the page, it will not be updated."
+                )
+                continue
+            setattr(self, recourse, parse_int(text))
+
+    def _scrape(
+        self, fields: dict[str, tuple[str, str, str | None]], page_url: str | None = None
+    ) -> dict[str, str | None] | None:
+        """
+        Reads values of several elements of the player's page with a single CDP call, see scrape().
+        """
+        return scrape(self.driver, fields, page_url)
+
+    def _snapshot_player_page(self) -> dict[str, str | None]:
+        """
+        Reads health, energy, stats, basic and inventory resources from the player page in one round-trip.
+
+        The scrape script also checks the page URL, so the player page is opened only if the driver
+        is not already on it.
+        """
+        fields = self.PLAYER_PAGE_FIELDS
+        snapshot = self._scrape(fields, self.BASE_URL)
+        if snapshot is None:
+            self.open()
+            snapshot = self._scrape(fields, self.BASE_URL)
+        if snapshot is None:
+            logger.error("Driver could not open the player page, player info was not read.")
+            return dict.fromkeys(fields)
+        return snapshot
+
+    def _update_player_page(self) -> None:
+        """
+        Updates everything shown on the player page from a single page load.
+        """
+        self._set_player_page(self._snapshot_player_page())
+
+    def ensure_player_page(self) -> None:
+        """
+        Loads level, health, energy, stats, basic and inventory resources from the player page,
+        unless they were loaded before. Opens the player page if needed, so call it before starting
+        an action that spans several pages.
+
+        Raises:
+            RuntimeError: If the player page could not be read.
+        """
+        if hasattr(self, "total_stats") and hasattr(self, "_hp_current"):
+            return None
+        self._update_player_page()
+        if not (hasattr(self, "total_stats") and hasattr(self, "_hp_current")):
+            raise RuntimeError("Player page could not be read, player info is not loaded.")
+
+    def _set_player_page(self, snapshot: dict[str, str | None]) -> None:
+        """
+        Sets health, energy, stats, basic and inventory resources from the values read from the player page.
+        """
+        self._set_health_and_energy(snapshot)
+        if self._set_stats(snapshot):
+            mark_fresh(self, "update_stats")
+        self._set_recourses_inventory(snapshot)
+        self._set_recourses_basic(snapshot)
+
+    def update_health_and_energy(self, is_refresh: bool = True) -> bool:
         """
         Updates the information about player's current health and energy levels.
+
+        Parameters:
+            is_refresh (bool): Whether to reload the page first. Defaults to True, pass False only if
+                the page was just loaded.
+
+        Returns:
+            bool: True if health and energy were read from the page.
         """
         if is_refresh:
-            self.driver.refresh()
-            random_delay()
+            self._refresh()
 
-        # Health
-        hp_max_el = self.driver.find_element(*self.LOCATORS["hp_max"])
-        hp_current_el = self.driver.find_element(*self.LOCATORS["hp_current"])
-        self.hp_max = float(hp_max_el.get_attribute("title") or 0)
-        self.hp_current = float(hp_current_el.get_attribute("title") or 0)
-        self.hp_current_prc = self.hp_current / self.hp_max
-
-        # Energy
-        mp_max_el = self.driver.find_element(*self.LOCATORS["mp_max"])
-        mp_current_el = self.driver.find_element(*self.LOCATORS["mp_current"])
-        self.mp_max = float(mp_max_el.text)
-        self.mp_current = float(mp_current_el.text)
-        self.mp_current_prc = self.mp_current / self.mp_max
+        return self._set_health_and_energy(self._scrape(self.HEALTH_AND_ENERGY_FIELDS) or {})
 
+    # Stats change only on level up or equipment change
+    @skip_if_fresh(300)
     @require_location_page
-    def update_stats(self) -> None:
+    def update_stats(self) -> bool:
         """
         Updates player's stats, including health, strength, dexterity, resistance,
         intuition, attention, charism, level, and experience.
+
+        Returns:
+            bool: True if the stats were updated.
         """
         logger.info("Updating player stats info.")
+        return self._set_stats(self._scrape(self.STATS_FIELDS) or {})
 
-        try:
-            # Stats
-            stats_list = [
-                "health",
-                "strength",
-                "dexterity",
-                "resistance",
-                "intuition",
-                "attention",
-                "charism",
-            ]
-            for stat in stats_list:
-                element_adress = f"//li[@data-type='{stat}']//span[@class='num']"
-                element = self.driver.find_element(By.XPATH, element_adress)
-                setattr(self, stat, int(element.text))
+    # TODO: move to Stash class
+    @skip_if_fresh(600)
+    def update_major_status(self) -> bool:
+        """
+        Updates the information about player's "major" status based on data from the stash page.
+
+        Returns:
+            bool: True if the status is known after the call.
+
+        TODO: potententially move to separate location class
+        """
+        if self._is_major_status_known():
+            logger.info(f"Major status is active until {self.major_expiration_date}, not updating it.")
+            return True
 
-            # Level
-            self.level = int(self.driver.find_element(*self.LOCATORS["level"]).text.strip("[]"))
+        logger.info("Updating major status.")
+        return self._set_major_status(self._load_page(self.STASH_URL))
 
-            # Experience
-            experience_el = self.driver.find_element(*self.LOCATORS["experience"])
-            current, needed = map(int, experience_el.text.split(" ")[1].split("/"))
-            self.experience = current
-            self.experience_needed_to_level = needed
+    def ensure_major_status(self) -> None:
+        """
+        Loads player's "major" status from the stash page, unless it was loaded before.
 
-            if needed - current <= 200:
-                logger.warning("There are less than 200 experience points to level up.")
+        Raises:
+            RuntimeError: If the stash page could not be read.
+        """
+        if hasattr(self, "major_is_active"):
+            return None
+        if not self.update_major_status(force=True):
+            raise RuntimeError("Stash page could not be read, major status is not loaded.")
 
-        except NoSuchElementException as e:
-            logger.error(f"Error updating player stats: {e}")
+    def _is_major_status_known(self) -> bool:
+        """
+        Checks if the major status read earlier is still active, so the stash page doesn't need to be loaded.
+        """
+        return self.major_expiration_date is not None and self.major_expiration_date > datetime.now()
 
-    # TODO: move to Stash class
-    def update_major_status(self) -> None:
+    def _set_major_status(self, tree: html.HtmlElement) -> bool:
         """
-        Updates the information about player's "major" status based on data from the stash page.
+        Sets player's "major" status and its expiration date from the parsed stash page.
 
-        TODO: potententially move to separate location class
+        Returns:
+            bool: True if the status was read, False if its expiration date could not be parsed.
         """
-        logger.info("Updating major status.")
-        self.driver.get("https://www.moswar.ru/stash/")
-        random_delay()
+        status_els = compiled_xpath(self.LOCATORS["major_status"][1])(tree)
+        self.major_is_active = bool(status_els)
+        self.major_expiration_date = None
+        if not status_els:
+            return True
 
+        date_match = MAJOR_DATE_RE.search(status_els[0].text_content())
         try:
-            self.driver.find_element(*self.LOCATORS["major_status"])
-            self.major_is_active = True
-        except NoSuchElementException:
-            self.major_is_active = False
+            self.major_expiration_date = parse_date(date_match.group()) if date_match else None
+        except ValueError:
+            logger.warning(f"Unexpected major expiration date format: '{date_match.group()}'")
+        return self.major_expiration_date is not None
 
     def update_recourses_basic(self) -> None:
         """
         Updates the information about player's basic resources, including money, ore, oil, and honey.
         """
-        basic_recourses = ["money", "ore", "oil", "honey"]
-        for recourse in basic_recourses:
-            try:
-                recourse_attr = self.driver.find_element(*self.LOCATORS[recourse]).get_attribute("title")
-                value = int(recourse_attr.split(" ")[1]) if recourse_attr else 0
-                setattr(self, recourse, value)
-            except NoSuchElementException:
-                logger.error(f"Basic recourse '{recourse}' not found on the page, it will not be updated.")
+        self._set_recourses_basic(self._scrape(self.RECOURSES_BASIC_FIELDS) or {})
 
     # TODO: add casino_chips
-    def update_recourses_advanced(self) -> None:
+    @skip_if_fresh(120)
+    def update_recourses_advanced(self) -> bool:
         """
         Updates the information about player's advanced resources, including mobiles, stars, hunter tokens, and others.
         TODO: potentially move to separate location classes
+
+        Returns:
+            bool: True if the resources were updated.
         """
         logger.info("Updating player advanced recourses info.")
-        self.driver.get("https://www.moswar.ru/berezka/")
-        random_delay()
+        return self._set_recourses_advanced(self._load_page(self.BEREZKA_URL))
 
-        base_xpath = self.LOCATORS["base"][1]
-        advanced_recourses = [
-            "mobiles",
-            "stars",
-            "hunter_tokens",
-            "tooth_white",
-            "pet_medals",
-            "powers",
-            "patriotisms",
-            "debts",
-        ]
+    def ensure_recourses_advanced(self) -> None:
+        """
+        Loads player's advanced resources from the berezka page, unless they were loaded before.
 
-        for recourse in advanced_recourses:
-            try:
-                xpath = base_xpath + self.LOCATORS[recourse][1]
-                value = int(self.driver.find_element(By.XPATH, xpath).text.replace(",", ""))
-                setattr(self, recourse, value)
-            except Exception:
+        Raises:
+            RuntimeError: If the berezka page could not be read.
+        """
+        if all(hasattr(self, recourse) for recourse in self.ADVANCED_RECOURSES):
+            return None
+        self.update_recourses_advanced(force=True)
+        if not all(hasattr(self, recourse) for recourse in self.ADVANCED_RECOURSES):
+            raise RuntimeError("Berezka page could not be read, advanced recourses are not loaded.")
+
+    def _set_recourses_advanced(self, tree: html.HtmlElement) -> bool:
+        """
+        Sets player's advanced resources from the parsed berezka page.
+
+        Returns:
+            bool: True if the resources block was found on the page.
+        """
+        # Resolve the base block once and search the resources only inside it
+        base_els = compiled_xpath(self.LOCATORS["base"][1])(tree)
+        if not base_els:
+            logger.error("Advanced recourses block not found on the page, they will not be updated.")
+            return False
+
+        # Collect all counters in one pass over the block instead of one search per resource
+        values: dict[str, str | None] = dict.fromkeys(self.ADVANCED_RECOURSES)
+        for span_el in compiled_xpath(".//span[@class]")(base_els[0]):
+            recourse = self.ADVANCED_CLASSES.get(span_el.get("class"))
+            if recourse and values[recourse] is None:
+                values[recourse] = span_el.text_content()
+
+        for recourse, text in values.items():
+            if text is None:
                 logger.error(f"Advanced recourse '{recourse}' not found on the page, it will not be updated.")
+                continue
+            setattr(self, recourse, parse_int(text))
+        return True
 
     @require_location_page
     def update_recourses_inventory(self) -> None:
@@ -329,126 +848,192 @@ class Player:
         Updates player's resources which can be found only in the inventory.
         """
         logger.info("Updating player inventory recourses info.")
+        self._set_recourses_inventory(self._scrape(self.RECOURSES_INVENTORY_FIELDS) or {})
 
-        inventory_recourses = [
-            "pielmienies",
-            "tonuses",
-            "snickers",
-            "irons",
-            "travel_shuffles",
-            "travel_passes",
-            "moskowpoly_dices",
-        ]
-        for recourse in inventory_recourses:
-            try:
-                xpath = self.LOCATORS[recourse][1] + "/parent::div//div[@class='count']"
-                value = int(self.driver.find_element(By.XPATH, xpath).text.replace("#", ""))
-                setattr(self, recourse, value)
-            except NoSuchElementException:
-                logger.error(
-                    f"Inventory recourse '{recourse}' not found on the page, it will not be updated."
-                )
-
-    def is_in_battle(self, is_refresh: bool = False) -> bool:
+    def is_in_battle(self, url: str | None = None) -> bool:
         """
         Return True if the player is currently in battle, else False.
-        """
-        if is_refresh:
-            self.driver.refresh()
-            random_delay()
 
-        if self.driver.current_url.startswith("https://www.moswar.ru/fight/"):
-            self.in_battle = True
-            return True
-        else:
-            self.in_battle = False
-            return False
+        Parameters:
+            url (str | None): Already known current URL of the driver. Defaults to None (read it).
+        """
+        url = url or self.driver.current_url
+        self.in_battle = url.startswith(self.FIGHT_URL)
+        return self.in_battle
 
-    def is_waiting_for_battle(self, is_refresh: bool = False) -> bool:
+    def is_waiting_for_battle(self) -> bool:
         """
         Return True if the player is currently waiting for a battle, else False.
         """
-        if is_refresh:
-            self.driver.refresh()
-            random_delay()
-
-        try:
-            self.driver.find_element(*self.LOCATORS["waiting_for_battle"])
-            self.awaits_battle = True
-            return True
-        except NoSuchElementException:
-            self.awaits_battle = False
-            return False
+        # Not waiting is the common case, so check without waiting for the element to appear
+        self.awaits_battle = bool(self.driver.find_elements(*self.LOCATORS["waiting_for_battle"]))
+        return self.awaits_battle
 
-    def is_in_underground(self, is_refresh: bool = False) -> bool:
+    def is_in_underground(self, url: str | None = None) -> bool:
         """
         Return True if the player is currently in underground, else False.
-        """
-        if is_refresh:
-            self.driver.refresh()
-            random_delay()
 
-        if self.driver.current_url.startswith("https://www.moswar.ru/dungeon/inside/"):
-            self.in_underground = True
-            return True
-        else:
-            self.in_underground = False
-            return False
+        Parameters:
+            url (str | None): Already known current URL of the driver. Defaults to None (read it).
+        """
+        url = url or self.driver.current_url
+        self.in_underground = url.startswith(self.DUNGEON_URL)
+        return self.in_underground
 
-    def update_actvities_status_blocking(self, is_refresh: bool = True) -> None:
+    def update_actvities_status_blocking(self, is_refresh: bool = False) -> None:
         """
-        Updates player blocking activities statuses.
+        Updates player blocking activities statuses. The current URL is read once for all URL based checks.
+
+        Parameters:
+            is_refresh (bool): Whether to reload the page first, to see a battle started since it was loaded.
+                Defaults to False, since battle and underground are detected from the URL alone.
         """
-        self.is_in_battle(is_refresh)
-        self.is_waiting_for_battle(is_refresh=False)
-        self.is_in_underground(is_refresh=False)
+        if is_refresh:
+            self._refresh()
+
+        url = self.driver.current_url
+        self.is_in_battle(url)
+        self.is_in_underground(url)
+        self.is_waiting_for_battle()
 
     def update_actvities_status_non_blocking(self) -> None:
         """
-        Updates player non-blocking activities statuses
+        Updates player non-blocking activities statuses.
+        The alley and shaurburgers pages are only read, so they are loaded like the stash and berezka pages.
         """
         from locations.alley import Alley
         from locations.locations_secondary import Shaurburgers
 
         logger.info("Updating player non-blocking activities statuses.")
 
-        self.update_actvities_status_blocking(is_refresh=False)
+        self.update_actvities_status_blocking()
         if self.in_battle or self.in_underground:
             logger.error("Cannot update other statuses while in battle or underground.")
             return
 
-        alley = Alley(self, self.driver)
-        alley.open()
-        self.on_patrol = alley.is_patrol_active()
-        self.patrol_time_left = alley.get_patrol_time_left()
-        self.on_TV = alley.is_TV_active()
-        self.TV_time_left = alley.get_TV_time_left()
+        self._read_side_pages(
+            {
+                Alley.BASE_URL: self._set_alley_statuses,
+                Shaurburgers.BASE_URL: self._set_work_status,
+            }
+        )
+
+    @staticmethod
+    def _minutes_left(tree: html.HtmlElement, xpath: str) -> int:
+        """
+        Reads the number of minutes from the time left counter found by xpath, 0 if there is no counter.
+        """
+        time_left_els = compiled_xpath(xpath)(tree)
+        return parse_minutes_left(time_left_els[0].text_content() if time_left_els else None)
+
+    def _set_alley_statuses(self, tree: html.HtmlElement) -> None:
+        """
+        Sets player's patrol and TV statuses from the parsed alley page.
+        """
+        from locations.alley import Alley
+
+        self.on_patrol = bool(compiled_xpath(Alley.LOCATORS["patrol_active"][1])(tree))
+        self.patrol_time_left = self._minutes_left(tree, Alley.LOCATORS["patrol_time_left"][1])
+        self.on_TV = bool(compiled_xpath(Alley.LOCATORS["TV_active"][1])(tree))
+        self.TV_time_left = self._minutes_left(tree, Alley.LOCATORS["TV_time_left"][1])
 
-        work = Shaurburgers(self, self.driver)
-        work.open()
-        self.on_work = work.is_work_active()
-        self.work_time_left = work.get_work_time_left()
+    def _set_work_status(self, tree: html.HtmlElement) -> None:
+        """
+        Sets player's work status from the parsed shaurburgers page.
+        """
+        from locations.locations_secondary import Shaurburgers
+
+        self.on_work = bool(compiled_xpath(Shaurburgers.LOCATORS["work_leave_button"][1])(tree))
+        if self.on_work:
+            logger.error("Can't get work time left, player is currently working.")
+            self.work_time_left = -9999
+            return None
+
+        # The last option of the shift length select is the number of hours left
+        select_name = Shaurburgers.LOCATORS["work_select_hours"][1]
+        options = compiled_xpath(f"//select[@name='{select_name}']/option")(tree)
+        hours_match = NUMBER_RE.search(options[-1].text_content()) if options else None
+        self.work_time_left = int(hours_match.group()) if hours_match else 0
 
     def update_player_info(self) -> None:
         """
         Updates all player information, including health, energy, stats, resources, and activities.
         """
         logger.info("Updating all player information.")
-        self.update_actvities_status_blocking(is_refresh=True)
+        url = self.driver.current_url
+        if url == self.BASE_URL:
+            # The player page opened here is read below without another reload
+            self.open(url=url)
+            self.update_actvities_status_blocking()
+        else:
+            self.update_actvities_status_blocking(is_refresh=True)
 
         if self.in_battle or self.in_underground:
             logger.error("Cannot update player info while in battle or underground.")
             return None
 
-        self.open()
-        self.update_health_and_energy(is_refresh=False)
-        self.update_stats()
-        self.update_recourses_inventory()
-        self.update_recourses_basic()
-        self.update_recourses_advanced()
-        self.update_major_status()
+        # Stash and berezka pages are independent, load them in the background while reading the player page
+        # Pages read recently enough are skipped, the same way their update methods would skip them
+        side_pages: dict[str, Callable[[html.HtmlElement], object]] = {}
+        # Major status doesn't change before its expiration date, so the stash is skipped until then
+        if not (self._is_major_status_known() or is_fresh(self, "update_major_status")):
+            side_pages[self.STASH_URL] = self._marking_fresh("update_major_status", self._set_major_status)
+        if not is_fresh(self, "update_recourses_advanced"):
+            side_pages[self.BEREZKA_URL] = self._marking_fresh(
+                "update_recourses_advanced", self._set_recourses_advanced
+            )
+        self._read_side_pages(side_pages, while_loading=self._update_player_page)
+
         self.update_actvities_status_non_blocking()
 
+    def _marking_fresh(
+        self, method_name: str, setter: Callable[[html.HtmlElement], bool]
+    ) -> Callable[[html.HtmlElement], bool]:
+        """
+        Wraps a page setter so that a successful read also counts as a run of the given update method.
+        """
+
+        def set_and_mark(tree: html.HtmlElement) -> bool:
+            result = setter(tree)
+            if result:
+                mark_fresh(self, method_name)
+            return result
+
+        return set_and_mark
+
+    def _read_side_pages(
+        self,
+        pages: dict[str, Callable[[html.HtmlElement], object]],
+        while_loading: Callable[[], None] | None = None,
+    ) -> None:
+        """
+        Loads read-only pages in the background and passes each parsed page to its setter.
+
+        Parameters:
+            pages (dict[str, Callable[[html.HtmlElement], object]]): Setters by page URL.
+            while_loading (Callable[[], None] | None): Work to do with the player's driver while
+                the pages are loading. Defaults to None.
+        """
+        if not pages:
+            if while_loading is not None:
+                while_loading()
+            return None
+
+        self._http_session()
+        with ThreadPoolExecutor(max_workers=len(pages)) as executor:
+            # Cookies are not renewed from the background threads, since that needs the player's driver
+            futures = {url: executor.submit(self._fetch_html, url, renew_cookies=False) for url in pages}
+
+            if while_loading is not None:
+                while_loading()
+
+            for url, future in futures.items():
+                # The browser fallback has to wait for the player's driver to be free
+                tree = future.result()
+                if tree is None:
+                    tree = self._load_page(url)
+                pages[url](tree)
+
     def show_player_info(self, show_all: bool = False) -> None:
         """
         Displays information about the player's current state, including health, energy,
@@ -457,6 +1042,11 @@ class Player:
         Parameters:
             show_all (bool): If True, displays additional player details. Default is False.
         """
+        self.ensure_player_page()
+        if show_all:
+            self.ensure_recourses_advanced()
+            self.ensure_major_status()
+
         info = [
             "Текущие состояния игрока:",
             f"Здоровье: {self.hp_current:,}/{self.hp_max:,} ({self.hp_current_prc * 100:.2f}%)",
@@ -535,18 +1125,20 @@ class Player:
         """
         logger.info("Restoring player health.")
 
-        self.update_health_and_energy()
+        if not self.update_health_and_energy():
+            logger.error("Player health is unknown, health was not restored.")
+            return None
         if self.hp_current_prc == 1.0:
             logger.error("Player health is full, there is no need to restore health.")
             return None
 
-        self.driver.find_element(*self.LOCATORS["restore_health_button"]).click()
-        random_delay()
-
-        self.driver.find_element(*self.LOCATORS["restore_health_confirm"]).click()
-        random_delay()
+        for step in ("restore_health_button", "restore_health_confirm"):
+            if not self._click(self.LOCATORS[step]):
+                logger.error(f"Element '{step}' was not found, player health was not restored.")
+                return None
+            random_delay()
 
-        self.update_health_and_energy(is_refresh=False)
+        self.update_health_and_energy()
         if self.hp_current_prc != 1.0:
             logger.error("Something went wrong, player health was not restored.")
         else:
@@ -562,24 +1154,24 @@ class Player:
         """
         logger.info("Restoring player energy.")
 
-        self.update_health_and_energy()
+        if not self.update_health_and_energy():
+            logger.error("Player energy is unknown, energy was not restored.")
+            return None
         if self.mp_current_prc == 1.0:
             logger.error("Player energy is full, there is no need to restore energy.")
             return None
 
-        self.driver.find_element(*self.LOCATORS["restore_energy_button"]).click()
+        if not self._click(self.LOCATORS["restore_energy_button"]):
+            logger.error("Restore energy button was not found.")
+            return None
         random_delay()
 
-        try:
-            self.driver.find_element(
-                *self.LOCATORS[f"restore_energy_{RestoreEnergyType.TONUS.value}"]
-            ).click()
-            random_delay()
-        except NoSuchElementException:
+        if not self._click(self.LOCATORS[f"restore_energy_{RestoreEnergyType.TONUS.value}"]):
             logger.error(f"Energy restore type '{restore_by}' is not available.")
             return None
+        random_delay()
 
-        self.update_health_and_energy(is_refresh=False)
+        self.update_health_and_energy()
         if self.mp_current_prc != 1.0:
             logger.error(f"Something went wrong, player energy could not be restored using {restore_by}.")
         else:
@@ -592,7 +1184,12 @@ class Player:
     @require_location_page
     def use_item(self, item: Literal["pielmienies", "tonuses", "snickers"], times: int) -> None:
         """
-        TBA
+        Uses a specified item from the inventory a given number of times.
+        All clicks are made by a single in-page script, keeping the 2-3 seconds pause between them.
+
+        Parameters:
+            item (Literal["pielmienies", "tonuses", "snickers"]): The name of the item to be used.
+            times (int): The number of times the item should be used.
         """
         if item not in ["pielmienies", "tonuses", "snickers"]:
             logger.error(f"Item '{item}' is not supported for use.")
@@ -600,52 +1197,66 @@ class Player:
 
         logger.info(f"Using '{item}' for {times} times.")
 
-    # TODO: refactor function + add minus in recources when using this
-    # def use_item(self, item: str, times: int) -> None:
-    #     """
-    #     Uses a specified item from the inventory a given number of times.
-
-    #     Parameters:
-    #         item (str): The name of the item to be used.
-    #         times (int): The number of times the item should be used.
-    #     """
-    #     logger.info(f"Using '{item}' for {times} times.")
-    #     self.open()
-
-    #     # Find item address TODO: create dict with item adresses in class dict?
-    #     # add that se can use itmes only from dict with available items
-    #     if item == "Полезный пельмень":
-    #         logger.info("Eating pielmienies, nyam nyam.")
-    #         item_el_addr = '//*[@id="inventory-stat_stimulator-btn"]'
-    #     else:
-    #         logger.error(f"Item '{item}' is not supported.")
-    #         return None
-
-    #     # Try to find item on page
-    #     try:
-    #         item_el = self.driver.find_element(By.XPATH, item_el_addr)
-    #     except NoSuchElementException:
-    #         logger.error(f"Item '{item}' is not available.")
-    #         return None
-
-    #     # Stop function if there are less items available than we want to use
-    #     count_el = item_el.find_element(By.XPATH, "../*[@class='count']")
-    #     count = int(count_el.text.replace("#", ""))
-    #     if count < times:
-    #         logger.error(f"Not enough '{item}' to use {times} times. There are only {count} available.")
-    #         return None
-
-    #     # Use items
-    #     used_times = 0
-    #     for _ in tqdm(range(times), desc=f"Using '{item}'"):
-    #         try:
-    #             item_el.click()
-    #             used_times += 1
-    #             random_delay(2, 3)
-    #         except Exception as e:
-    #             logger.error("Something went wrong while using the item, stopping.")
-    #             logger.error(e)
-    #             return None
-
-    #     logger.info(f"Used '{item}' for {used_times} times.")
-    #     return None
+        # Stop function if there are less items available than we want to use
+        self.update_recourses_inventory()
+        count: int = getattr(self, item)
+        if count < times:
+            logger.error(f"Not enough '{item}' to use {times} times. There are only {count} available.")
+            return None
+
+        # Use items, the script runs for up to 3 seconds per click
+        use_button_xpath = self.INVENTORY_ACTION_XPATHS[item]
+        script_timeout = self.driver.timeouts.script
+        self.driver.set_script_timeout(times * 3 + 10)
+        try:
+            used_times: int = self.driver.execute_async_script(USE_ITEM_JS, use_button_xpath, times)
+        except Exception as e:
+            logger.error("Something went wrong while using the item, stopping.")
+            logger.error(e)
+            return None
+        finally:
+            self.driver.set_script_timeout(script_timeout)
+            self._last_open_ts = 0.0
+
+        setattr(self, item, count - used_times)
+        if used_times < times:
+            logger.error(f"Item '{item}' was used only {used_times} times out of {times}.")
+        else:
+            logger.info(f"Used '{item}' for {used_times} times.")
+
+
+Player.HEALTH_AND_ENERGY_FIELDS = {
+    "hp_max": (*Player.LOCATORS["hp_max"], "title"),
+    "hp_current": (*Player.LOCATORS["hp_current"], "title"),
+    "mp_max": (*Player.LOCATORS["mp_max"], None),
+    "mp_current": (*Player.LOCATORS["mp_current"], None),
+}
+Player.STATS_FIELDS = {
+    **{stat: (By.CSS_SELECTOR, f"li[data-type='{stat}'] span.num", None) for stat in Player.STATS},
+    "level": (*Player.LOCATORS["level"], None),
+    "experience": (*Player.LOCATORS["experience"], None),
+}
+# Basic resources are read from the title of the header blocks
+Player.RECOURSES_BASIC_FIELDS = {
+    recourse: (*Player.LOCATORS[recourse], "title") for recourse in Player.BASIC_RECOURSES
+}
+# Inventory resources are read from the count next to the item image
+Player.RECOURSES_INVENTORY_FIELDS = {
+    recourse: (By.XPATH, Player.LOCATORS[recourse][1] + "/parent::div//div[@class='count']", None)
+    for recourse in Player.INVENTORY_RECOURSES
+}
+Player.INVENTORY_ACTION_XPATHS = {
+    recourse: Player.LOCATORS[recourse][1] + "/parent::div//div[@class='action']"
+    for recourse in Player.INVENTORY_RECOURSES
+}
+Player.PLAYER_PAGE_FIELDS = {
+    **Player.HEALTH_AND_ENERGY_FIELDS,
+    **Player.STATS_FIELDS,
+    **Player.RECOURSES_BASIC_FIELDS,
+    **Player.RECOURSES_INVENTORY_FIELDS,
+}
+# Advanced resources locators are "//span[@class='...']", the class is the part between the quotes
+Player.ADVANCED_CLASSES = {
+    Player.LOCATORS[recourse][1].split("'")[1]: recourse for recourse in Player.ADVANCED_RECOURSES
+}
+# Player page values fall back to zero, except percentages which the setters default to full
@@ -1,12 +1,18 @@
-from typing import Literal, Optional
-
-from selenium.common.exceptions import NoSuchElementException
+import time
+from typing import Any, Callable, ClassVar, Literal, Optional
+
+from selenium.common.exceptions import (
+    NoSuchElementException,
+    StaleElementReferenceException,
+    TimeoutException,
+)
 from selenium.webdriver.chrome.webdriver import WebDriver
 from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.webelement import WebElement
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import Select, WebDriverWait
 
-from entities.player import Player
+from entities.player import PAGE_FRESH_SEC, Player, parse_minutes_left, scrape
 from schemas.alley import EnemySearchType, ResetTimerType
 from utils.custom_logging import logger
 from utils.decorators import require_location_page
@@ -16,6 +22,44 @@ from utils.human_simulation import random_delay
 # address TODOs in the code
 # add противостояние
 
+# How long a status snapshot is reused by the is_*/get_* status methods
+STATE_FRESH_SEC = 1.0
+
+# Sums the enemy stats in one round-trip, also returns the first stat element to wait for its replacement
+ENEMY_STATS_JS = """
+const [selector, playerStatsSum] = arguments;
+const stats = document.querySelectorAll(selector);
+let sum = 0;
+for (const stat of stats) {
+    // Thousands separators are dropped like in parse_int() on the player side
+    sum += parseInt(stat.textContent.replace(/\\D/g, ""), 10) || 0;
+}
+return [sum, sum > playerStatsSum, stats.length ? stats[0] : null];
+"""
+
+# Reads the rest timer value in one round-trip, null if there is no timer on the page
+REST_TIMER_JS = """
+const timer = document.querySelector(arguments[0]);
+return timer ? timer.getAttribute("timer") : null;
+"""
+
+# Sets the enemy level inputs (found by name) that differ from the wanted values,
+# returns the names of the changed ones
+SET_ENEMY_LEVELS_JS = """
+const [levels] = arguments;
+const changed = [];
+for (const [name, value] of Object.entries(levels)) {
+    const input = document.getElementsByName(name)[0];
+    if (input.value !== value) {
+        input.value = value;
+        input.dispatchEvent(new Event("input", { bubbles: true }));
+        input.dispatchEvent(new Event("change", { bubbles: true }));
+        changed.push(name);
+    }
+}
+return changed;
+"""
+
 
 class Alley:
     """
@@ -27,22 +71,23 @@ class Alley:
         BASE_URL: Base URL for the Alley page.
     """
 
-    # TODO: optimize locators if possible
+    # Attribute-only locators are CSS, the browser matches them natively. Locators matching text stay XPath,
+    # as do the patrol and TV status ones, which Player also evaluates with lxml on the fetched page.
     BASE_URL = "https://www.moswar.ru/alley/"
     LOCATORS: dict[str, tuple[str, str]] = {
         # Rest timers
-        "rest_timer": (By.XPATH, "//span[@class='timer' and contains(@trigger, 'end_alley_cooldown')]"),
-        "rest_reset_enegry": (By.XPATH, "//div[@onclick=\"cooldownReset('tonus');\"]"),
-        "rest_reset_enegry_cost": (By.XPATH, "//span[@class='tonus']"),
-        "rest_reset_snikers": (By.XPATH, "//div[@onclick=\"cooldownReset('snikers');\"]"),
+        "rest_timer": (By.CSS_SELECTOR, "span[class='timer'][trigger*='end_alley_cooldown']"),
+        "rest_reset_enegry": (By.CSS_SELECTOR, "div[onclick=\"cooldownReset('tonus');\"]"),
+        "rest_reset_enegry_cost": (By.CSS_SELECTOR, "span[class='tonus']"),
+        "rest_reset_snikers": (By.CSS_SELECTOR, "div[onclick=\"cooldownReset('snikers');\"]"),
         # Enemy search start
         "enemy_weak": (By.CSS_SELECTOR, ".button-big.btn.f1"),
         "enemy_equal": (By.CSS_SELECTOR, ".button-big.btn.f2"),
         "enemy_strong": (By.CSS_SELECTOR, ".button-big.btn.f3"),
         "enemy_major_bar": (By.ID, "search-enemy-bar"),
         "enemy_major_bar_toggle": (
-            By.XPATH,
-            "//span[@class='dashedlink' and @onclick='toggleSearchEnemyBar();']",
+            By.CSS_SELECTOR,
+            "span[class='dashedlink'][onclick='toggleSearchEnemyBar();']",
         ),
         "enemy_level_min": (By.NAME, "minlevel"),
         "enemy_level_max": (By.NAME, "maxlevel"),
@@ -51,26 +96,28 @@ class Alley:
         # "enemy_name_find": "TBA",
         # Enemy search end
         "enemy_stats_table": (
-            By.XPATH,
-            '//td[@class="fighter2-cell"]//ul[@class="stats"]//span[@class="num"]',
+            By.CSS_SELECTOR,
+            "td[class='fighter2-cell'] ul[class='stats'] span[class='num']",
         ),
-        "enemy_find_another": (By.XPATH, '//a[contains(@href, "/alley/search/again/")]'),
-        "enemy_attack": (By.XPATH, "//div[@class='button button-fight']"),
+        "enemy_find_another": (By.CSS_SELECTOR, "a[href*='/alley/search/again/']"),
+        "enemy_attack": (By.CSS_SELECTOR, "div[class='button button-fight']"),
         # Patrol
         "patrol_start_button": (By.XPATH, '//div[text()="Патрулировать — "]'),
-        "patrol_select_minutes": (By.XPATH, '//*[@id="patrolForm"]/div[2]/select'),
+        "patrol_select_minutes": (By.CSS_SELECTOR, "#patrolForm > div:nth-of-type(2) > select"),
         "patrol_active": (By.XPATH, "//td[@class='label' and text()='Патрулирование:']"),
         "patrol_time_left": (By.XPATH, '//form[@class="patrol" and @id="patrolForm"]//p[@class="timeleft"]'),
         # Caravan
-        "caravan_available": (By.XPATH, "//a[@href='/desert/']"),
+        "caravan_available": (By.CSS_SELECTOR, "a[href='/desert/']"),
         "caravan_rob": (By.XPATH, '//*[contains(text(), "Грабить караваны!")]'),
         "caravan_result": (By.CLASS_NAME, "text"),
         # Patriot TV
-        "TV_select_hours": (By.XPATH, '//*[@id="patriottvForm"]/div/select'),
+        "TV_select_hours": (By.CSS_SELECTOR, "#patriottvForm > div > select"),
         "TV_start_button": (By.XPATH, '//div[text()="Смотреть ТВ"]'),
         "TV_active": (By.XPATH, "//td[@class='label' and text()='Просмотр:']"),
         "TV_time_left": (By.XPATH, '//form[@class="patrol" and @id="patriottvForm"]//p[@class="timeleft"]'),
     }
+    # Patrol, TV and caravan status fields read by snapshot_state(), built from LOCATORS below the class
+    STATE_FIELDS: ClassVar[dict[str, tuple[str, str, str | None]]]
 
     def __init__(self, player: Player, driver: WebDriver):
         """
@@ -82,6 +129,27 @@ class Alley:
         """
         self.player = player
         self.driver = driver
+        # Alley actions check the player's level, energy, stats and major status, possibly mid-search,
+        # so they are loaded before any alley page is opened
+        self.player.ensure_player_page()
+        self.player.ensure_major_status()
+        # Waits for the page state expected after an action instead of sleeping for a fixed time
+        self.wait = WebDriverWait(driver, 10)
+        # Last status snapshot and when it was read, dropped after actions that change the statuses
+        self._state: dict[str, Any] | None = None
+        self._state_ts = 0.0
+        # Last page load done by open(), reset by actions that change the page
+        self._last_open_ts = 0.0
+
+    def _wait_until(self, condition: Callable[[WebDriver], Any]) -> bool:
+        """
+        Waits until the condition is met, returns False if it's not met in time.
+        """
+        try:
+            self.wait.until(condition)
+            return True
+        except TimeoutException:
+            return False
 
     def is_opened(self) -> bool:
         """
@@ -89,18 +157,82 @@ class Alley:
         """
         return self.driver.current_url == self.BASE_URL
 
-    def open(self) -> None:
+    def open(self, force: bool = False) -> None:
         """
         Ensure the driver is on the alley page, navigating or refreshing as needed.
+
+        Parameters:
+            force (bool): If True, reloads the page even if it was opened moments ago. Defaults to False.
         """
         if not self.is_opened():
             logger.info("Driver is not on the alley page. Going to the alley.")
             self.driver.get(self.BASE_URL)
-            random_delay()
+        elif not force and time.monotonic() - self._last_open_ts < PAGE_FRESH_SEC:
+            logger.info("Driver has just opened the alley page, skipping reload.")
+            return
         else:
             logger.info("Driver is already on the alley page, refreshing.")
             self.driver.refresh()
-            random_delay()
+
+        # The rest timer is on every alley page view
+        self._state = None
+        if not self._wait_until(EC.presence_of_element_located(self.LOCATORS["rest_timer"])):
+            logger.warning("Alley page was not loaded in time.")
+        # Clicks usually follow, so the human-like pause is kept after the load
+        random_delay()
+        self._last_open_ts = time.monotonic()
+
+    def _mark_changed(self) -> None:
+        """
+        Drops the status snapshot and the page freshness after an action that changes the page.
+        """
+        self._state = None
+        self._last_open_ts = 0.0
+
+    def _ensure_selected(self, locator: tuple[str, str], visible_text: str) -> None:
+        """
+        Selects the option with the given text, unless it's already selected.
+        """
+        select = Select(self.driver.find_element(*locator))
+        if select.first_selected_option.text == visible_text:
+            return None
+
+        select.select_by_visible_text(visible_text)
+        random_delay()
+
+    @require_location_page
+    def snapshot_state(self) -> dict[str, Any]:
+        """
+        Reads patrol, TV and caravan statuses with a single in-page script and updates the player.
+        The is_*/get_* status methods reuse the snapshot for STATE_FRESH_SEC seconds.
+
+        Returns:
+            dict[str, Any]: patrol_active, patrol_time_left, TV_active, TV_time_left and caravan_available.
+        """
+        values = scrape(self.driver, self.STATE_FIELDS) or {}
+        state = {
+            "patrol_active": values.get("patrol_active") is not None,
+            "patrol_time_left": parse_minutes_left(values.get("patrol_time_left")),
+            "TV_active": values.get("TV_active") is not None,
+            "TV_time_left": parse_minutes_left(values.get("TV_time_left")),
+            "caravan_available": values.get("caravan_available") is not None,
+        }
+
+        self.player.on_patrol = state["patrol_active"]
+        self.player.patrol_time_left = state["patrol_time_left"]
+        self.player.on_TV = state["TV_active"]
+        self.player.TV_time_left = state["TV_time_left"]
+
+        self._state, self._state_ts = state, time.monotonic()
+        return state
+
+    def _get_state(self) -> dict[str, Any]:
+        """
+        Return the last status snapshot if it's fresh, otherwise read a new one.
+        """
+        if self._state is not None and time.monotonic() - self._state_ts < STATE_FRESH_SEC:
+            return self._state
+        return self.snapshot_state()
 
     # ------------------------
     # FIGHTING SINGLE ENEMY
@@ -109,8 +241,16 @@ class Alley:
     def is_rest_active(self) -> bool:
         """
         Return True if the player is currently resting, else False.
-        """
-        timer_value = self.driver.find_element(*self.LOCATORS["rest_timer"]).get_attribute("timer")
+        If the rest timer is not on the page yet, waits for it and reads it again. If it is still
+        missing, the player is treated as resting, so no action is started on an unknown state.
+        """
+        timer_value = self.driver.execute_script(REST_TIMER_JS, self.LOCATORS["rest_timer"][1])
+        if timer_value is None:
+            logger.warning("Rest timer not found on the page, waiting for it.")
+            self._wait_until(EC.presence_of_element_located(self.LOCATORS["rest_timer"]))
+            timer_value = self.driver.execute_script(REST_TIMER_JS, self.LOCATORS["rest_timer"][1])
+        if timer_value is None:
+            logger.error("Rest timer still not found on the page, assuming the player is resting.")
         if timer_value and timer_value.count("-") > 0:
             self.player.on_rest = False
             return False
@@ -127,7 +267,8 @@ class Alley:
             logger.error("Player is not resting, can't reset the timer.")
             return None
 
-        # Reset
+        # Reset, the timer element is kept to see when the page updates it
+        timer_el = self.driver.find_element(*self.LOCATORS["rest_timer"])
         if reset_timer_type == reset_timer_type.ENERGY:
             logger.info("Resetting energy timer by using enegry.")
 
@@ -141,7 +282,6 @@ class Alley:
                 self.driver.find_element(*self.LOCATORS["rest_reset_enegry"]).click()
                 self.player.mp_current -= energy_cost
                 logger.info(f"Energy timer reset, current energy: {self.player.mp_current}")
-            random_delay()
 
         elif reset_timer_type == reset_timer_type.SNICKERS:
             logger.info("Resetting rest timer by using sneakers.")
@@ -152,16 +292,26 @@ class Alley:
 
             self.driver.find_element(*self.LOCATORS["rest_reset_snikers"]).click()
             self.player.snickers -= 1
-            random_delay()
 
-        # Check
-        random_delay(min_time=5, max_time=6)
-        self.driver.refresh()
+        # Check, the page is reloaded only if the timer wasn't updated in place
+        self._mark_changed()
+        if not self._wait_until(lambda _: self._is_timer_updated(timer_el)):
+            self.driver.refresh()
         if not self.is_rest_active():
             logger.info("Rest timer successfully reset.")
         else:
             logger.error("Failed to reset rest timer, player is still resting.")
 
+    @staticmethod
+    def _is_timer_updated(timer_el: WebElement) -> bool:
+        """
+        Return True if the rest timer has run out or its element was replaced by the page.
+        """
+        try:
+            return "-" in (timer_el.get_attribute("timer") or "")
+        except StaleElementReferenceException:
+            return True
+
     def _search_enemy_by_level(
         self,
         enemy_level_min: Optional[int] = None,
@@ -190,28 +340,16 @@ class Alley:
             self.driver.find_element(*self.LOCATORS["enemy_major_bar_toggle"]).click()
             random_delay()
 
-        # Set enemy min level
+        # Set enemy min and max level, both inputs are read and updated in one round-trip
         enemy_level_min = enemy_level_min or self.player.level + 1
-        enemy_level_min_str = str(enemy_level_min)
-
-        set_enemy_level_min_el = self.driver.find_element(*self.LOCATORS["enemy_level_min"])
-        curr_value_min = set_enemy_level_min_el.get_attribute("value")
-        if curr_value_min != enemy_level_min_str:
-            logger.info(f"Enemy minimum level is not {enemy_level_min_str}. Updating it.")
-            set_enemy_level_min_el.clear()
-            set_enemy_level_min_el.send_keys(enemy_level_min_str)
-            random_delay()
-
-        # Set enemy max level
         enemy_level_max = enemy_level_max or self.player.level + 1
-        enemy_level_max_str = str(enemy_level_max)
-
-        set_enemy_level_max_el = self.driver.find_element(*self.LOCATORS["enemy_level_max"])
-        value_max = set_enemy_level_max_el.get_attribute("value")
-        if value_max != enemy_level_max_str:
-            logger.info(f"Enemy maximum level is not {enemy_level_max_str}. Updating it.")
-            set_enemy_level_max_el.clear()
-            set_enemy_level_max_el.send_keys(enemy_level_max_str)
+        levels = {
+            self.LOCATORS["enemy_level_min"][1]: str(enemy_level_min),
+            self.LOCATORS["enemy_level_max"][1]: str(enemy_level_max),
+        }
+        changed = self.driver.execute_script(SET_ENEMY_LEVELS_JS, levels)
+        if changed:
+            logger.info(f"Enemy level range is updated to {enemy_level_min}-{enemy_level_max}.")
             random_delay()
 
         self.driver.find_element(*self.LOCATORS["enemy_level_find"]).click()
@@ -262,6 +400,16 @@ class Alley:
         if not self.driver.current_url.startswith(self.BASE_URL + "search/"):
             logger.error("Failed to start enemy search, driver is not on the search page.")
 
+    def _read_enemy_stats(self, player_stats_sum: int) -> tuple[int, bool, WebElement | None]:
+        """
+        Return the sum of the found enemy's stats, whether it exceeds player_stats_sum,
+        and the first stat element (None if there are no stats).
+        """
+        enemy_stats_sum, too_strong, enemy_stat_el = self.driver.execute_script(
+            ENEMY_STATS_JS, self.LOCATORS["enemy_stats_table"][1], player_stats_sum
+        )
+        return enemy_stats_sum, too_strong, enemy_stat_el
+
     def finish_enemy_search(self) -> None:
         """
         Complete the enemy search and attack a suitable enemy.
@@ -270,26 +418,23 @@ class Alley:
             logger.error("Failed to finish enemy search, driver is not on the search page.")
             return None
 
-        player_stats_sum = (
-            self.player.health
-            + self.player.strength
-            + self.player.dexterity
-            + self.player.resistance
-            + self.player.intuition
-            + self.player.attention
-            + self.player.charism
-        )
+        player_stats_sum = self.player.total_stats
 
         # Search
         finished_enemy_search = False
         while not finished_enemy_search:
-            enemy_stat_elements = self.driver.find_elements(*self.LOCATORS["enemy_stats_table"])
-            enemy_stats_sum = sum([int(element.text) for element in enemy_stat_elements])
+            enemy_stats_sum, too_strong, enemy_stat_el = self._read_enemy_stats(player_stats_sum)
 
-            if enemy_stats_sum > player_stats_sum:
-                logger.warning("Enemy stats are too high, trying to find another enemy.")
+            if too_strong:
+                logger.warning(
+                    f"Enemy stats are too high ({enemy_stats_sum:,} > {player_stats_sum:,}), "
+                    "trying to find another enemy."
+                )
                 self.driver.find_element(*self.LOCATORS["enemy_find_another"]).click()
-                random_delay()
+                # Next enemy is read once the old stats are gone, the short pause is kept as jitter
+                if enemy_stat_el is not None:
+                    self._wait_until(EC.staleness_of(enemy_stat_el))
+                random_delay(1, 2)
             else:
                 logger.info("Enemy found, attacking.")
                 finished_enemy_search = True
@@ -302,6 +447,7 @@ class Alley:
             EC.presence_of_element_located(self.LOCATORS["enemy_attack"])
         )
         attack_enemy_el.click()
+        self._mark_changed()
         self.player.on_rest = True
         random_delay()
         self.open()
@@ -319,27 +465,14 @@ class Alley:
         """
         Return True if the player is currently on patrol, else False.
         """
-        try:
-            self.driver.find_element(*self.LOCATORS["patrol_active"])
-            self.player.on_patrol = True
-            return True
-        except NoSuchElementException:
-            self.player.on_patrol = False
-            return False
+        return self._get_state()["patrol_active"]
 
     @require_location_page
     def get_patrol_time_left(self) -> int:
         """
         Get the remaining patrol time in minutes.
         """
-        try:
-            time_left_el = self.driver.find_element(*self.LOCATORS["patrol_time_left"])
-            time_left = int(time_left_el.text.split(" ")[-2])
-        except Exception:
-            time_left = 0
-
-        self.player.patrol_time_left = time_left
-        return time_left
+        return self._get_state()["patrol_time_left"]
 
     @require_location_page
     def start_patrol(self, patrol_minutes: Literal[20, 40] = 20) -> None:
@@ -375,17 +508,17 @@ class Alley:
 
         # Start patrol
         patrol_minutes_str = str(patrol_minutes) + " минут"
-        select_patrol_minutes_el = Select(self.driver.find_element(*self.LOCATORS["patrol_select_minutes"]))
-        select_patrol_minutes_el.select_by_visible_text(patrol_minutes_str)
-        random_delay()
+        self._ensure_selected(self.LOCATORS["patrol_select_minutes"], patrol_minutes_str)
 
         start_patrol_el = self.driver.find_element(*self.LOCATORS["patrol_start_button"])
         start_patrol_el.click()
+        self._mark_changed()
 
         # Check
-        random_delay(min_time=5, max_time=6)
+        self._wait_until(EC.presence_of_element_located(self.LOCATORS["patrol_active"]))
         if self.is_patrol_active():
-            self.player.patrol_time_left -= patrol_minutes
+            # The snapshot read by the check may not show the time left while on patrol
+            self.player.patrol_time_left = patrol_time_left - patrol_minutes
             logger.info(
                 f"Patrol successfully started, patrol time left: {self.player.patrol_time_left} minutes."
             )
@@ -400,11 +533,7 @@ class Alley:
         """
         Return True if a caravan is available to rob, else False.
         """
-        try:
-            self.driver.find_element(*self.LOCATORS["caravan_available"])
-            return True
-        except NoSuchElementException:
-            return False
+        return self._get_state()["caravan_available"]
 
     @require_location_page
     def rob_caravan(self) -> None:
@@ -427,6 +556,7 @@ class Alley:
 
             caravan_el_1 = self.driver.find_element(*self.LOCATORS["caravan_available"])
             caravan_el_1.click()
+            self._mark_changed()
             random_delay()
 
             caravan_el_2 = self.driver.find_element(*self.LOCATORS["caravan_rob"])
@@ -455,27 +585,14 @@ class Alley:
         """
         Return True if the player is currently watching Patriot TV, else False.
         """
-        try:
-            self.driver.find_element(*self.LOCATORS["TV_active"])
-            self.player.on_TV = True
-            return True
-        except NoSuchElementException:
-            self.player.on_TV = False
-            return False
+        return self._get_state()["TV_active"]
 
     @require_location_page
     def get_TV_time_left(self) -> int:
         """
         Get the remaining Patriot TV watching time in minutes.
         """
-        try:
-            time_left_el = self.driver.find_element(*self.LOCATORS["TV_time_left"])
-            time_left = int(time_left_el.text.split(" ")[-2])
-        except Exception:
-            time_left = 0
-
-        self.player.TV_time_left = time_left
-        return time_left
+        return self._get_state()["TV_time_left"]
 
     @require_location_page
     def start_watching_TV(self, watch_hours: Literal[1] = 1) -> None:
@@ -510,19 +627,24 @@ class Alley:
             return None
 
         # Start watching TV
-        select_watch_hours_el = Select(self.driver.find_element(*self.LOCATORS["TV_select_hours"]))
-        select_watch_hours_el.select_by_visible_text(f"{watch_hours} час")
-        random_delay()
+        self._ensure_selected(self.LOCATORS["TV_select_hours"], f"{watch_hours} час")
 
         start_watch_el = self.driver.find_element(*self.LOCATORS["TV_start_button"])
         start_watch_el.click()
+        self._mark_changed()
 
         # Check
-        random_delay(min_time=5, max_time=6)
+        self._wait_until(EC.presence_of_element_located(self.LOCATORS["TV_active"]))
         if self.is_TV_active():
-            self.player.TV_time_left -= watch_hours
+            self.player.TV_time_left = watch_time_left - watch_hours
             logger.info(
                 f"Patriot TV session successfully started, time left: {self.player.TV_time_left} hours."
             )
         else:
             logger.error("Failed to start Patriot TV session")
+
+
+Alley.STATE_FIELDS = {
+    key: (*Alley.LOCATORS[key], None)
+    for key in ("patrol_active", "patrol_time_left", "TV_active", "TV_time_left", "caravan_available")
+}
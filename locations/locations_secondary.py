@@ -10,7 +10,7 @@ from entities.player import Player
 from schemas.locations_secondary import FactoryPage
 from utils.custom_logging import logger
 from utils.decorators import require_location_page, require_page_prefix
-from utils.general import parse_date
+from utils.general import find_or_none, parse_date
 from utils.human_simulation import random_delay
 
 
@@ -66,13 +66,8 @@ class Shaurburgers:
         """
         Return True if the player is currently working, else False.
         """
-        try:
-            self.driver.find_element(*self.LOCATORS["work_leave_button"])
-            self.player.on_work = True
-            return True
-        except NoSuchElementException:
-            self.player.on_work = False
-            return False
+        self.player.on_work = find_or_none(self.driver, self.LOCATORS["work_leave_button"]) is not None
+        return self.player.on_work
 
     @require_location_page
     def get_work_time_left(self) -> int:
@@ -238,10 +233,9 @@ class Casino:
         random_delay()
 
         # Check
-        try:
-            self.driver.find_element(*self.LOCATORS["buy_chips_error"])
+        if find_or_none(self.driver, self.LOCATORS["buy_chips_error"]) is not None:
             logger.error(f"Can't buy {amount} chips, player is not allowed to buy.")
-        except NoSuchElementException:
+        else:
             self.player.casino_chips += amount
             logger.info(f"Successfully bought {amount} chips.")
 
@@ -292,7 +286,7 @@ class Police:
             self.driver.refresh()
             random_delay()
 
-    @require_page_prefix("https://www.moswar.ru/police/")
+    @require_page_prefix(BASE_URL)
     def are_connections_established(self) -> bool:
         """
         Return True if the player has established police connections, else False.
@@ -459,6 +453,9 @@ class Factory:
         """
         self.player = player
         self.driver = driver
+        # Production and purchases update the player's ore, money, mobiles and stars
+        self.player.ensure_player_page()
+        self.player.ensure_recourses_advanced()
 
     def is_opened(self, page: FactoryPage = FactoryPage.BASE) -> bool:
         """
@@ -650,14 +647,9 @@ class TrainerVip:
         time_seconds = timedelta(hours=time_hours, minutes=time_minutes).total_seconds()
 
         # Additionaly check if Bojara filtering is not used
-        try:
-            _ = self.driver.find_element(
-                By.XPATH,
-                '//div[@class="c" and contains(text(), "Отфильтровать боярышник")]',
-            )
+        filter_locator = (By.XPATH, '//div[@class="c" and contains(text(), "Отфильтровать боярышник")]')
+        if find_or_none(self.driver, filter_locator) is not None:
             logger.warning("Bojara filtering is not yet used!")
-        except NoSuchElementException:
-            pass
 
         return time_seconds
 
@@ -26,7 +26,7 @@ from schemas.player import RestoreEnergyType
 
 load_dotenv()
 
-options = set_options()
+options = set_options(debugger_address=os.getenv("CHROME_DEBUGGER_ADDRESS"))
 driver = webdriver.Chrome(options=options)
 
 # Login (TODO: fix cookies expiration)
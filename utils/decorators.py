@@ -1,4 +1,5 @@
 import functools
+import time
 from typing import Any, Callable
 
 from utils.custom_logging import logger
@@ -37,3 +38,46 @@ def require_page_prefix(prefix: str):
         return functools.update_wrapper(wrapper, func)
 
     return decorator
+
+
+def skip_if_fresh(seconds: float):
+    """
+    Decorator that skips an update method if it already ran on the same object less than the given number
+    of seconds ago. A skipped call returns True, since the values read by the earlier run are still current.
+    Pass force=True to run it anyway. Only runs that return a truthy value count, so a failed
+    or aborted update (e.g. by require_location_page) is not skipped next time. Run times are kept in
+    the object's _last_update_ts dict by method name, see is_fresh() and mark_fresh().
+    """
+
+    def decorator(func: F) -> F:
+        @functools.wraps(func)
+        def wrapper(self: Any, *args: Any, force: bool = False, **kwargs: Any) -> Any:
+            if not force and is_fresh(self, func.__name__):
+                logger.info(f"'{func.__name__}' ran less than {seconds} seconds ago, skipping.")
+                return True
+            result = func(self, *args, **kwargs)
+            if result:
+                mark_fresh(self, func.__name__)
+            return result
+
+        wrapper.fresh_seconds = seconds  # type: ignore[attr-defined]
+        return wrapper
+
+    return decorator
+
+
+def is_fresh(obj: Any, method_name: str) -> bool:
+    """
+    Checks if the object's method decorated with skip_if_fresh ran recently enough to be skipped.
+    """
+    last_update_ts = obj._last_update_ts.get(method_name)
+    seconds = getattr(type(obj), method_name).fresh_seconds
+    return last_update_ts is not None and time.monotonic() - last_update_ts < seconds
+
+
+def mark_fresh(obj: Any, method_name: str) -> None:
+    """
+    Records that the values of the object's method decorated with skip_if_fresh were just read,
+    for code that reads them without calling the method itself.
+    """
+    obj._last_update_ts[method_name] = time.monotonic()
@@ -1,4 +1,9 @@
 from datetime import datetime
+from typing import Any
+
+from selenium.common.exceptions import JavascriptException
+from selenium.webdriver.chrome.webdriver import WebDriver
+from selenium.webdriver.remote.webelement import WebElement
 
 
 def parse_date(date_str: str) -> datetime:
@@ -29,3 +34,40 @@ def parse_date(date_str: str) -> datetime:
             break
 
     return datetime.strptime(date_str, "%d %m %Y %H:%M")
+
+
+def cdp_evaluate(driver: WebDriver, expression: str, await_promise: bool = False) -> Any:
+    """
+    Evaluates a JavaScript expression on the current page via CDP Runtime.evaluate and returns its value.
+    The whole result comes back in one DevTools call, serialized by value.
+
+    Parameters:
+        driver (WebDriver): Chrome driver to evaluate the expression in.
+        expression (str): JavaScript expression to evaluate.
+        await_promise (bool): Whether to wait for the returned promise and return its result.
+            Defaults to False.
+
+    Raises:
+        JavascriptException: If the expression throws in the page.
+    """
+    response = driver.execute_cdp_cmd(
+        "Runtime.evaluate",
+        {"expression": expression, "returnByValue": True, "awaitPromise": await_promise},
+    )
+    if "exceptionDetails" in response:
+        details = response["exceptionDetails"]
+        raise JavascriptException(details.get("exception", {}).get("description") or details.get("text"))
+    return response["result"].get("value")
+
+
+def find_or_none(driver: WebDriver, locator: tuple[str, str]) -> WebElement | None:
+    """
+    Finds the first element matching the locator, or returns None if there is none.
+    Uses find_elements, so a missing element doesn't raise and doesn't wait for the implicit timeout.
+
+    Parameters:
+        driver (WebDriver): Driver to search the current page of.
+        locator (tuple[str, str]): Locator of the element.
+    """
+    elements = driver.find_elements(*locator)
+    return elements[0] if elements else None